@@ -0,0 +1,4 @@
+from .cli_interface import cli_entry_point
+
+if __name__ == '__main__':
+    cli_entry_point()
@@ -1,11 +1,14 @@
 import os
+import sys
+from contextvars import ContextVar
 from copy import copy
-from time import sleep
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from time import sleep, time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
 import click
 from .formatter import CliFormatter, JsonFormatter, ListDictStrAny, DictStrAny
-from .utils import name_from_file_path
+from .utils import cache_dir, name_from_file_path
 from .veertu_manager import (
     VeertuManager,
     get_veertu_manager,
@@ -14,67 +17,134 @@ from .veertu_manager import (
     VMNotFoundException,
     ImportExportFailedException
 )
-import tarfile
-import plistlib
 
-# Global instances, type hinted
-veertu_mngr: VeertuManager = get_veertu_manager() # Renamed for clarity
-cli_fmt: Union[CliFormatter, JsonFormatter] = CliFormatter()
+# The manager is built on first use: constructing it probes Veertu.app over
+# osascript, which `--help` and import alone should not pay for.
+# The formatter is context-local rather than a mutable global, so in-process callers
+# running commands concurrently each get the one their own `main` selected.
+Formatter = Union[CliFormatter, JsonFormatter]
+_cli_fmt: ContextVar[Formatter] = ContextVar('cli_fmt', default=CliFormatter())
+
+# A successful `version()` handshake is trusted for this many seconds across invocations.
+_HANDSHAKE_TTL = 300.0
+
+# Fields `show` prints for a VM that is not running.
+_SHOW_KEEP = ('id', 'name', 'status')
+
+
+def _fmt() -> Formatter:
+    """Returns the formatter selected for the current invocation."""
+    return _cli_fmt.get()
+
+
+def _handshake_path() -> str:
+    return os.path.join(cache_dir(), 'handshake.ok')
+
+
+def _handshake_fresh() -> bool:
+    try:
+        return time() - os.path.getmtime(_handshake_path()) < _HANDSHAKE_TTL
+    except OSError:
+        return False
+
+
+def _mark_handshake_fresh() -> None:
+    path = _handshake_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a'):
+            pass
+        os.utime(path, None)
+    except OSError:
+        pass # The cache is an optimisation; a read-only home just means no skipping
+
+
+def veertu_mngr() -> VeertuManager:
+    """Returns the process-wide VeertuManager, creating it on first call."""
+    return get_veertu_manager()
+
+
+def _call_manager(method: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[bool, Any]:
+    """
+    Runs a VeertuManager call, reporting a missing VM or manager error through the formatter.
+    Returns (True, result) on success and (False, None) once the failure has been reported.
+    """
+    fmt = _fmt()
+    try:
+        return True, method(*args, **kwargs)
+    except VMNotFoundException:
+        fmt.format_vm_not_exist()
+    except VeertuManagerException as e:
+        fmt.echo_status_failure(message=str(e))
+    return False, None
 
 
 class CliContext(object):
     def __init__(self) -> None:
         self.machine_readable: bool = False
+        # Set by cli_entry_point when the command line only asks for help.
+        self.skip_handshake: bool = False
         self.vm_id: Optional[str] = None
 
 
+# Parameters shared by several commands, declared once so their definitions cannot drift.
+_vm_id_argument = click.argument('vm_id', type=str)
+_force_option = click.option('--force', is_flag=True, default=False)
+_input_file_argument = click.argument('input_file', type=click.Path(exists=True, dir_okay=False, readable=True))
+_os_family_option = click.option('--os-family', default=None, type=str)
+_os_type_option = click.option('--os-type', default=None, type=str)
+_name_option = click.option('--name', default=None, type=str)
+
+
 @click.group()
 @click.option('--machine-readable', is_flag=True, default=False)
+@click.option('--no-cache', is_flag=True, default=False,
+              help='Do not reuse results cached by earlier invocations.')
 @click.pass_context
-def main(ctx: click.Context, machine_readable: bool) -> None:
-    global cli_fmt # Ensure we're re-assigning the global formatter
-    try:
-        veertu_mngr.version()
-    except VeertuAppNotFoundException:
-        # Handle early if app is not found, before CliContext is even fully used by commands
-        # cli_fmt might still be the default CliFormatter here.
-        cli_fmt.echo_status_failure(message='Veertu app not found. Please ensure Veertu Desktop is installed and configured.')
-        ctx.exit(1) # Exit early
-    except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=f"Veertu manager error on init: {str(e)}")
-        ctx.exit(1)
-
+def main(ctx: click.Context, machine_readable: bool, no_cache: bool) -> None:
+    # Set unconditionally so a previous in-process --machine-readable call does not leak.
+    fmt: Formatter = JsonFormatter() if machine_readable else CliFormatter()
+    _cli_fmt.set(fmt)
+    ctx.ensure_object(CliContext)
+    if not ctx.obj.skip_handshake and (no_cache or not _handshake_fresh()):
+        try:
+            if veertu_mngr().version():
+                _mark_handshake_fresh()
+        except VeertuAppNotFoundException:
+            # Handle early if app is not found, before CliContext is even fully used by commands
+            fmt.echo_status_failure(message='Veertu app not found. Please ensure Veertu Desktop is installed and configured.')
+            ctx.exit(1) # Exit early
+        except VeertuManagerException as e:
+            fmt.echo_status_failure(message=f"Veertu manager error on init: {str(e)}")
+            ctx.exit(1)
+    if not ctx.obj.skip_handshake:
+        # Set every time: in-process callers reuse the manager across invocations
+        veertu_mngr().use_property_cache = not no_cache
 
-    ctx.obj = CliContext()
     if machine_readable:
-        if isinstance(ctx.obj, CliContext): # Type guard for mypy
-            ctx.obj.machine_readable = True
-        cli_fmt = JsonFormatter()
+        ctx.obj.machine_readable = True
 
 
 @click.command(name="list", help='Shows a list of VMs, ids and names') # Explicit command name
 def list_vms() -> None: # Renamed to avoid conflict with built-in list
+    fmt = _fmt()
     try:
-        vms_list: ListDictStrAny = veertu_mngr.list()
-        cli_fmt.format_list_output(vms_list)
+        vms_list: ListDictStrAny = veertu_mngr().list()
+        fmt.format_list_output(vms_list)
     except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
+        fmt.echo_status_failure(message=str(e))
 
 
 @click.command(help='Show runtime VM state and properties. VM can be name or id.')
-@click.argument('vm_id', type=str)
+@_vm_id_argument
 @click.option('--state', 'show_state', default=False, is_flag=True, help='Show state of vm') # Renamed for clarity
 @click.option('--ip-address', 'show_ip_address', default=False, is_flag=True, help='Show ip address of vm') # Renamed
 @click.option('--port-forwarding', 'show_port_forwarding', default=False, is_flag=True, help='show port forwarding info of vm') # Renamed
 @click.pass_context
 def show(ctx: click.Context, vm_id: str, show_state: bool, show_ip_address: bool, show_port_forwarding: bool) -> None:
-    try:
-        vm_info: DictStrAny = veertu_mngr.show(vm_id)
-    except VMNotFoundException:
-        cli_fmt.format_vm_not_exist()
-        return
-    except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
+    fmt = _fmt()
+    ok, vm_info = _call_manager(veertu_mngr().show, vm_id)
+    if not ok:
         return
 
     if show_state:
@@ -83,156 +153,152 @@ def show(ctx: click.Context, vm_id: str, show_state: bool, show_ip_address: bool
         click.echo(str(vm_info.get('ip', 'N/A')))
     if show_port_forwarding:
         pf_info: ListDictStrAny = vm_info.get('port_forwarding', [])
-        cli_fmt.format_port_forwarding_info(pf_info)
+        fmt.format_port_forwarding_info(pf_info)
 
-    if any([show_state, show_ip_address, show_port_forwarding]):
+    if show_state or show_ip_address or show_port_forwarding:
         return
 
-    current_ctx_obj: Optional[CliContext] = ctx.obj if isinstance(ctx.obj, CliContext) else None
-    if not current_ctx_obj:
-        cli_fmt.echo_status_failure(message="CLI context not properly initialized.")
-        return
+    current_ctx_obj = cast(CliContext, ctx.obj)
 
     if vm_info.get('status', False) != 'running' and not current_ctx_obj.machine_readable:
-        keep_keys = ['id', 'name', 'status']
         # Create a new dict for the filtered info
-        filtered_vm_info: DictStrAny = {
-            k: v for k, v in vm_info.items() if k in keep_keys
-        }
-        cli_fmt.format_show_output(filtered_vm_info)
+        filtered_vm_info: DictStrAny = {k: vm_info[k] for k in _SHOW_KEEP if k in vm_info}
+        fmt.format_show_output(filtered_vm_info)
     else:
-        cli_fmt.format_show_output(vm_info)
+        fmt.format_show_output(vm_info)
 
 
 @click.command(help='Starts or resumes paused VM')
-@click.argument('vm_id', type=str)
+@_vm_id_argument
 @click.option('--restart', is_flag=True, default=False)
 def start(vm_id: str, restart: bool) -> None:
-    try:
-        success: bool = veertu_mngr.start(vm_id, restart=restart)
-        cli_fmt.format_start_output(success, restart=restart, vm_id=vm_id)
-    except VMNotFoundException:
-        cli_fmt.format_vm_not_exist()
-    except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
+    fmt = _fmt()
+    ok, success = _call_manager(veertu_mngr().start, vm_id, restart=restart)
+    if ok:
+        fmt.format_start_output(success, restart=restart, vm_id=vm_id)
 
 
 @click.command(help='Pauses a VM')
-@click.argument('vm_id', type=str)
+@_vm_id_argument
 def pause(vm_id: str) -> None:
-    try:
-        success: bool = veertu_mngr.pause(vm_id)
-        cli_fmt.format_pause_output(success, vm_id=vm_id)
-    except VMNotFoundException:
-        cli_fmt.format_vm_not_exist()
-    except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
+    fmt = _fmt()
+    ok, success = _call_manager(veertu_mngr().pause, vm_id)
+    if ok:
+        fmt.format_pause_output(success, vm_id=vm_id)
 
 
 @click.command(help='Shuts down a vm')
-@click.argument('vm_id', type=str)
-@click.option('--force', is_flag=True, default=False)
+@_vm_id_argument
+@_force_option
 def shutdown(vm_id: str, force: bool) -> None:
-    try:
-        success: bool = veertu_mngr.shutdown(vm_id, force=force)
-        cli_fmt.format_shutdown_output(success, vm_id=vm_id)
-    except VMNotFoundException:
-        cli_fmt.format_vm_not_exist()
-    except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
+    fmt = _fmt()
+    ok, success = _call_manager(veertu_mngr().shutdown, vm_id, force=force)
+    if ok:
+        fmt.format_shutdown_output(success, vm_id=vm_id)
 
 
 @click.command(help='Restarts a VM')
-@click.argument('vm_id', type=str)
-@click.option('--force', is_flag=True, default=False)
+@_vm_id_argument
+@_force_option
 def reboot(vm_id: str, force: bool) -> None:
-    try:
-        success: bool = veertu_mngr.reboot(vm_id, force=force)
-        cli_fmt.format_reboot_output(success, vm_id=vm_id)
-    except VMNotFoundException:
-        cli_fmt.format_vm_not_exist()
-    except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
+    fmt = _fmt()
+    ok, success = _call_manager(veertu_mngr().reboot, vm_id, force=force)
+    if ok:
+        fmt.format_reboot_output(success, vm_id=vm_id)
 
 
 @click.command(name='delete', help="Deletes a VM") # Explicit command name
-@click.argument('vm_id', type=str)
+@_vm_id_argument
 @click.option('--yes', is_flag=True, default=False, help="Confirm deletion without prompting.")
 @click.pass_context
 def delete_vm(ctx: click.Context, vm_id: str, yes: bool) -> None:
-    current_ctx_obj: Optional[CliContext] = ctx.obj if isinstance(ctx.obj, CliContext) else None
-    if not current_ctx_obj:
-        cli_fmt.echo_status_failure(message="CLI context not properly initialized.")
+    fmt = _fmt()
+    current_ctx_obj = cast(CliContext, ctx.obj)
+    ok, vm_details_for_confirm = _call_manager(veertu_mngr().show, vm_id)
+    if not ok:
         return
-    try:
-        # show() can raise VMNotFoundException, which is caught below.
-        vm_details_for_confirm: DictStrAny = veertu_mngr.show(vm_id)
-        if not yes and not current_ctx_obj.machine_readable:
+    if not yes and not current_ctx_obj.machine_readable:
+        try:
             click.confirm(
                 f"Are you sure you want to delete vm {vm_details_for_confirm.get('id', vm_id)} {vm_details_for_confirm.get('name', '')}?",
                 abort=True
             )
+        except click.exceptions.Abort:
+            click.echo("Deletion aborted by user.")
+            return
 
-        success: bool = veertu_mngr.delete(vm_id) # This can also raise VMNotFoundException
-        cli_fmt.format_delete_output(success, vm_id=vm_id)
-    except VMNotFoundException: # Catches from either show() or delete()
-        cli_fmt.format_vm_not_exist()
-    except click.exceptions.Abort:
-        click.echo("Deletion aborted by user.")
-    except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
+    ok, success = _call_manager(veertu_mngr().delete, vm_id)
+    if ok:
+        fmt.format_delete_output(success, vm_id=vm_id)
 
 
 @click.command(help='Exports a vm to a file')
-@click.argument('vm_id', type=str)
+@_vm_id_argument
 @click.argument('output_file', type=click.Path(exists=False, dir_okay=False, writable=True))
 @click.option('--fmt', 'export_format', default='vmz', type=click.Choice(['vmz', 'box']), required=False, show_default=True) # Renamed
 @click.option('--silent', is_flag=True, default=False)
 @click.pass_context
 def export(ctx: click.Context, vm_id: str, output_file: str, export_format: str, silent: bool) -> None:
-    current_ctx_obj: Optional[CliContext] = ctx.obj if isinstance(ctx.obj, CliContext) else None
-    if not current_ctx_obj:
-        cli_fmt.echo_status_failure(message="CLI context not properly initialized.")
-        return
+    fmt = _fmt()
+    current_ctx_obj = cast(CliContext, ctx.obj)
     try:
         # If machine_readable, manager handles progress loop silently.
         # Otherwise, this CLI part handles progress bar display if not silent.
         actual_silent_for_manager = current_ctx_obj.machine_readable or silent
         do_cli_progress_loop = not actual_silent_for_manager
 
-        if not silent and os.path.isfile(output_file): # Check for overwrite only if CLI is interactive
+        def run_export(overwrite: bool) -> Union[str, bool]:
+            # export_vm is untyped: the handle, or True/False once its progress loop has run
+            return cast(Union[str, bool], veertu_mngr().export_vm(
+                vm_id, output_file, fmt=export_format,
+                silent=actual_silent_for_manager, # Manager is silent if machine_readable or explicit --silent
+                do_progress_loop=actual_silent_for_manager, # Manager loops if it's silent (machine_readable or --silent)
+                overwrite=overwrite
+            ))
+
+        # The manager checks the final path (after it appends the format extension), so
+        # only ask about overwriting when it reports a clash; --silent overwrites as before.
+        try:
+            export_result: Union[str, bool] = run_export(overwrite=silent)
+        except FileExistsError:
             click.confirm('File exists, do you want to overwrite?', default=False, abort=True)
-
-        export_result: Union[str, bool] = veertu_mngr.export_vm(
-            vm_id, output_file, fmt=export_format,
-            silent=actual_silent_for_manager, # Manager is silent if machine_readable or explicit --silent
-            do_progress_loop=actual_silent_for_manager # Manager loops if it's silent (machine_readable or --silent)
-        )
+            export_result = run_export(overwrite=True)
 
         if do_cli_progress_loop: # Interactive CLI, needs to show progress bar
             if isinstance(export_result, str): # This is the handle
                 length = 100 if export_format == 'vmz' else 200
                 _do_import_export_progress_bar(export_result, length)
-                cli_fmt.echo_status_ok(message="Export completed.") # Success message after loop
+                fmt.echo_status_ok(message="Export completed.") # Success message after loop
             elif not export_result : # Explicit False from manager, means it couldn't even start
-                cli_fmt.echo_status_failure(message='Could not export vm. Export process did not start.')
+                fmt.echo_status_failure(message='Could not export vm. Export process did not start.')
         # If actual_silent_for_manager was true, manager handled the loop.
         # We assume success if no exception, or rely on manager's output if it's machine_readable.
         # If machine_readable and export_result was False, it indicates an issue.
         elif current_ctx_obj.machine_readable and isinstance(export_result, bool) and not export_result:
-            cli_fmt.echo_status_failure(message="Export failed (machine-readable mode).")
+            fmt.echo_status_failure(message="Export failed (machine-readable mode).")
 
 
     except VMNotFoundException:
-        cli_fmt.format_vm_not_exist()
+        fmt.format_vm_not_exist()
     except ImportExportFailedException as e:
-        cli_fmt.echo_status_failure(message=f"Export failed: {str(e)}")
+        fmt.echo_status_failure(message=f"Export failed: {str(e)}")
     except click.exceptions.Abort:
         click.echo("Export aborted by user.")
     except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
+        fmt.echo_status_failure(message=str(e))
     except Exception as e:
-        cli_fmt.echo_status_failure(message=f"An unexpected error occurred during export: {str(e)}")
+        fmt.echo_status_failure(message=f"An unexpected error occurred during export: {str(e)}")
+
+
+# Bounds (seconds) and growth factor of the delay between progress polls.
+_PROGRESS_POLL_MIN_DELAY = 0.05
+_PROGRESS_POLL_MAX_DELAY = 2.0
+_PROGRESS_POLL_BACKOFF = 1.5
+
+
+def _bar_increment(step: int, bar_pos: int, bar_length: int) -> int:
+    """Clamps a progress step so the bar never moves backwards or past its end."""
+    return min(max(0, step), bar_length - bar_pos)
 
 
 def _do_import_export_progress_bar(handle: str, length: int) -> None:
@@ -242,24 +308,24 @@ def _do_import_export_progress_bar(handle: str, length: int) -> None:
         with click.progressbar(length=length, show_eta=False, label=f"Processing task {handle[:8]}...") as bar:
             progress: int = 0
             previous_progress: int = 0
+            delay: float = _PROGRESS_POLL_MIN_DELAY
             while progress < length:
-                current_progress_val: int = veertu_mngr.progress(handle) # progress() should return int or raise
+                current_progress_val: int = veertu_mngr().progress(handle) # progress() should return int or raise
                 progress = current_progress_val
 
                 step: int = progress - previous_progress
-
-                if step == 0 and progress < length:
-                    sleep(1) # Avoid busy-waiting if no progress and not done
-
-                update_val = max(0, step)
-                if bar.pos + update_val > bar.length: # Prevent overshooting
-                    update_val = bar.length - bar.pos
-
-                bar.update(update_val)
+                bar.update(_bar_increment(step, bar.pos, length))
                 previous_progress = progress
 
                 if progress >= length: # Ensure loop terminates
                     break
+
+                # Poll quickly while the task moves, back off while it stalls.
+                if step > 0:
+                    delay = _PROGRESS_POLL_MIN_DELAY
+                sleep(delay)
+                if step <= 0:
+                    delay = min(delay * _PROGRESS_POLL_BACKOFF, _PROGRESS_POLL_MAX_DELAY)
     except ImportExportFailedException as e: # Handled by manager.progress
         # Print above the (now broken) progress bar.
         click.echo(f"\nError during progress update: {str(e)}", err=True)
@@ -270,10 +336,10 @@ def _do_import_export_progress_bar(handle: str, length: int) -> None:
 
 
 @click.command(name='import', help='Import a vm into Veertu') # Explicit command name
-@click.argument('input_file', type=click.Path(exists=True, dir_okay=False, readable=True))
-@click.option('--os-family', default=None, type=str)
-@click.option('--os-type', default=None, type=str)
-@click.option('--name', default=None, type=str)
+@_input_file_argument
+@_os_family_option
+@_os_type_option
+@_name_option
 @click.option('--fmt', 'import_format', default=None, type=str) # Renamed
 @click.option('-n', '--get-name-suggestion', is_flag=True, default=False, help="Suggest a name for the VM based on the file.")
 @click.pass_context
@@ -286,21 +352,19 @@ def import_vm(
     import_format: Optional[str],
     get_name_suggestion: bool
 ) -> None:
+    fmt = _fmt()
     if get_name_suggestion:
         suggested_name = _try_guess_name(input_file)
         click.echo(f'Suggested VM name: "{suggested_name}"')
         return
 
-    current_ctx_obj: Optional[CliContext] = ctx.obj if isinstance(ctx.obj, CliContext) else None
-    if not current_ctx_obj:
-        cli_fmt.echo_status_failure(message="CLI context not properly initialized.")
-        return
+    current_ctx_obj = cast(CliContext, ctx.obj)
 
     try:
         actual_silent_for_manager = current_ctx_obj.machine_readable
         do_cli_progress_loop = not actual_silent_for_manager
 
-        import_result: Union[str, bool] = veertu_mngr.import_vm(
+        import_result: Union[str, bool] = veertu_mngr().import_vm(
             input_file, name, os_family, os_type, import_format,
             silent=actual_silent_for_manager,
             do_progress_loop=actual_silent_for_manager
@@ -309,41 +373,55 @@ def import_vm(
         if do_cli_progress_loop:
             if isinstance(import_result, str):
                 _do_import_export_progress_bar(import_result, 100)
-                cli_fmt.echo_status_ok(message="Import process completed.")
+                fmt.echo_status_ok(message="Import process completed.")
             elif not import_result:
-                cli_fmt.echo_status_failure(message='Could not import VM. Import process did not start.')
+                fmt.echo_status_failure(message='Could not import VM. Import process did not start.')
         elif actual_silent_for_manager: # Machine readable or silent
             if isinstance(import_result, bool) and not import_result:
-                 cli_fmt.echo_status_failure(message="Import process reported failure.")
+                 fmt.echo_status_failure(message="Import process reported failure.")
             else: # Assume success (True or handle string)
-                 cli_fmt.echo_status_ok()
+                 fmt.echo_status_ok()
 
     except ImportExportFailedException as e:
-        cli_fmt.echo_status_failure(
+        fmt.echo_status_failure(
             message=f"Veertu failed to import {input_file}. Error: {str(e)}"
         )
     except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
+        fmt.echo_status_failure(message=str(e))
     except Exception as e:
-        cli_fmt.echo_status_failure(message=f"An unexpected error occurred during import: {str(e)}")
+        fmt.echo_status_failure(message=f"An unexpected error occurred during import: {str(e)}")
 
 
 def _try_guess_name(file_path: str) -> str:
     """Tries to guess a VM name from a .box file's metadata or the filename."""
     try:
-        # Try reading as a tar.gz file (common for .box)
-        with tarfile.open(file_path, 'r:gz') as tf:
+        mtime = os.path.getmtime(file_path)
+    except OSError:
+        return name_from_file_path(file_path)
+    # Keyed on mtime so a rewritten archive is parsed again.
+    return _guess_name_from_archive(file_path, mtime)
+
+
+@lru_cache(maxsize=32)
+def _guess_name_from_archive(file_path: str, mtime: float) -> str:
+    # Only `import --get-name-suggestion` reads archives; keep these off the start-up path.
+    import plistlib
+    import tarfile
+
+    try:
+        # Stream the tar.gz (common for .box) and stop at settings.plist, so the
+        # disk images after it are never decompressed or indexed.
+        with tarfile.open(file_path, 'r|gz') as tf:
             d: DictStrAny = {}
             plist_content_bytes: Optional[bytes] = None
-            # Efficiently find and extract settings.plist if it exists
-            try:
-                member = tf.getmember('settings.plist') # Check if member exists
+            for member in tf:
+                if os.path.normpath(member.name) != 'settings.plist':
+                    continue
                 extracted_file = tf.extractfile(member)
                 if extracted_file:
                     plist_content_bytes = extracted_file.read()
                     extracted_file.close()
-            except KeyError: # settings.plist not found in tar
-                pass
+                break
 
             if plist_content_bytes:
                 try:
@@ -364,10 +442,10 @@ def _try_guess_name(file_path: str) -> str:
 
 
 @click.command(name='create') # Explicit command name
-@click.argument('input_file', type=click.Path(exists=True, dir_okay=False, readable=True))
-@click.option('--os-family', default=None, type=str)
-@click.option('--os-type', default=None, type=str)
-@click.option('--name', default=None, type=str)
+@_input_file_argument
+@_os_family_option
+@_os_type_option
+@_name_option
 @click.pass_context
 def create_vm(
     ctx: click.Context,
@@ -376,60 +454,57 @@ def create_vm(
     os_type: Optional[str],
     name: Optional[str]
 ) -> None:
-    current_ctx_obj: Optional[CliContext] = ctx.obj if isinstance(ctx.obj, CliContext) else None
-    if not current_ctx_obj:
-        cli_fmt.echo_status_failure(message="CLI context not properly initialized.")
-        return
+    fmt = _fmt()
+    current_ctx_obj = cast(CliContext, ctx.obj)
 
     try:
-        new_uuid: Optional[str] = veertu_mngr.create_vm(input_file, name, os_family, os_type)
-        cli_fmt.format_create(new_uuid)
+        new_uuid: Optional[str] = veertu_mngr().create_vm(input_file, name, os_family, os_type)
+        fmt.format_create(new_uuid)
         if new_uuid and not current_ctx_obj.machine_readable:
             if click.confirm('Would you like to start the new vm?', default=False):
-                veertu_mngr.start(new_uuid)
+                veertu_mngr().start(new_uuid)
     except VMNotFoundException:
-        cli_fmt.format_vm_not_exist() # Should not happen for create, but start can raise it
+        fmt.format_vm_not_exist() # Should not happen for create, but start can raise it
     except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
+        fmt.echo_status_failure(message=str(e))
     except click.exceptions.Abort: # User chose not to start the VM
         click.echo("VM start aborted by user.")
     except Exception as e:
-        cli_fmt.echo_status_failure(message=f"An unexpected error occurred during VM creation: {str(e)}")
+        fmt.echo_status_failure(message=f"An unexpected error occurred during VM creation: {str(e)}")
 
 
 @click.command(help='Show all data for a VM')
-@click.argument('vm_id', type=str)
+@_vm_id_argument
 def describe(vm_id: str) -> None:
-    try:
-        vm_dict: DictStrAny = veertu_mngr.describe(vm_id)
-        cli_fmt.format_describe(vm_dict)
-    except VMNotFoundException:
-        cli_fmt.format_vm_not_exist()
-    except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
+    fmt = _fmt()
+    ok, vm_dict = _call_manager(veertu_mngr().describe, vm_id)
+    if ok:
+        fmt.format_describe(vm_dict)
 
 
 @click.group(help='Modifys a VM settings')
-@click.argument('vm_id', type=str)
+@_vm_id_argument
 @click.pass_context
 def modify(ctx: click.Context, vm_id: str) -> None:
+    fmt = _fmt()
     # Ensure CliContext exists on ctx.obj
     if not isinstance(ctx.obj, CliContext):
         ctx.obj = CliContext() # Initialize if not present (e.g. modify called directly)
 
-    # Store vm_id in context
-    ctx.obj.vm_id = vm_id
-
     # Verify vm exists before proceeding to subcommands to provide early feedback
     try:
-        veertu_mngr.show(vm_id) # A light check, show() itself handles VMNotFound
+        vm_info: DictStrAny = veertu_mngr().show(vm_id, port_forwarding=False)
     except VMNotFoundException:
-        cli_fmt.format_vm_not_exist()
+        fmt.format_vm_not_exist()
         ctx.exit(1) # Prevent subcommands from running if VM doesn't exist
     except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=f"Error verifying VM {vm_id}: {str(e)}")
+        fmt.echo_status_failure(message=f"Error verifying VM {vm_id}: {str(e)}")
         ctx.exit(1)
 
+    # Hand the subcommands the resolved id, so a VM given by name does not send
+    # each of their calls through the manager's name fallback.
+    ctx.obj.vm_id = vm_info.get('id') or vm_id
+
 
 @modify.command(name="set", help="Set various properties of a VM.")
 @click.pass_context
@@ -457,44 +532,54 @@ def set_options(
     network_card_idx: Optional[str],
     network_type: Optional[str]
 ) -> None:
-    current_ctx_obj: Optional[CliContext] = ctx.obj if isinstance(ctx.obj, CliContext) else None
-    if not current_ctx_obj or current_ctx_obj.vm_id is None: # vm_id should be set by 'modify' group
-        cli_fmt.echo_status_failure(message="VM ID not found in context. This is an internal error.")
+    fmt = _fmt()
+    current_ctx_obj = cast(CliContext, ctx.obj)
+    if current_ctx_obj.vm_id is None: # vm_id should be set by 'modify' group
+        fmt.echo_status_failure(message="VM ID not found in context. This is an internal error.")
         return
 
     vm_id: str = current_ctx_obj.vm_id
     good_ones: DictStrAny = {}
     bad_ones: DictStrAny = {}
 
-    any_option_provided = any(opt is not None for opt in [headless, new_name, cpu, ram, network_card_idx, network_type])
+    any_option_provided = (headless is not None or new_name is not None or cpu is not None or ram is not None
+                           or network_card_idx is not None or network_type is not None)
     if not any_option_provided:
         click.echo("No options provided to set. Use --help for available options.", err=True)
         return
 
+    # Collected into one manager call so all settings are applied in a single round trip.
+    props: DictStrAny = {}
+    if headless is not None:
+        props['headless'] = headless
+    if new_name is not None:
+        props['name'] = new_name
+    if cpu is not None:
+        props['cpu'] = cpu
+    if ram is not None:
+        props['ram'] = ram
+    if network_card_idx is not None and network_type is not None:
+        props['network_type'] = (network_card_idx, network_type)
+
     try:
-        if headless is not None:
-            _add_to_dict(veertu_mngr.set_headless(vm_id, headless), 'headless', headless, good_ones, bad_ones)
-        if new_name is not None:
-            _add_to_dict(veertu_mngr.rename(vm_id, new_name), 'name', new_name, good_ones, bad_ones)
-        if cpu is not None:
-            _add_to_dict(veertu_mngr.set_cpu(vm_id, cpu), 'cpu', cpu, good_ones, bad_ones)
-        if ram is not None:
-            _add_to_dict(veertu_mngr.set_ram(vm_id, ram), 'ram', ram, good_ones, bad_ones)
-
-        if network_card_idx is not None and network_type is not None:
-            _add_to_dict(veertu_mngr.set_network_type(vm_id, network_card_idx, network_type),
-                         f'network type for card {network_card_idx}', network_type, good_ones, bad_ones)
-        elif network_card_idx is not None or network_type is not None:
+        results: Dict[str, bool] = veertu_mngr().set_properties(vm_id, props)
+        for key, applied in results.items():
+            value = props[key]
+            if key == 'network_type':
+                key, value = f'network type for card {network_card_idx}', network_type
+            _add_to_dict(applied, key, value, good_ones, bad_ones)
+
+        if (network_card_idx is None) != (network_type is None):
              _add_to_dict(False, 'network modification', 'Both --network-card-idx and --network-type are required together.', good_ones, bad_ones)
 
-        cli_fmt.format_properties_changed(good_ones, bad_ones)
+        fmt.format_properties_changed(good_ones, bad_ones)
 
     except VMNotFoundException: # Should be caught by modify group, but as safeguard
-        cli_fmt.format_vm_not_exist()
+        fmt.format_vm_not_exist()
     except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
+        fmt.echo_status_failure(message=str(e))
     except Exception as e: # Catch-all for unexpected issues
-        cli_fmt.echo_status_failure(message=f"An unexpected error occurred while setting options: {str(e)}")
+        fmt.echo_status_failure(message=f"An unexpected error occurred while setting options: {str(e)}")
 
 
 def _add_to_dict(success: bool, key: str, value: Any, good_ones: DictStrAny, bad_ones: DictStrAny) -> None:
@@ -508,10 +593,11 @@ def _add_to_dict(success: bool, key: str, value: Any, good_ones: DictStrAny, bad
 @modify.group(help="Add components to a VM.")
 @click.pass_context
 def add(ctx: click.Context) -> None:
+    fmt = _fmt()
     # This group function ensures that vm_id is available in ctx.obj
     # The 'modify' group should have already set it and verified VM existence.
-    if not isinstance(ctx.obj, CliContext) or ctx.obj.vm_id is None:
-        cli_fmt.echo_status_failure(message="VM ID not found in context for 'add' commands. This indicates an internal setup error.")
+    if cast(CliContext, ctx.obj).vm_id is None:
+        fmt.echo_status_failure(message="VM ID not found in context for 'add' commands. This indicates an internal setup error.")
         ctx.exit(1)
 
 
@@ -532,19 +618,20 @@ def add_port_forwarding_rule(
     guest_port: int,
     protocol: str
 ) -> None:
+    fmt = _fmt()
     # vm_id is asserted to be non-None by the 'add' group context check
     vm_id: str = ctx.obj.vm_id # type: ignore
 
     try:
         # Manager expects strings for ports based on original implementation; adapt if manager API changes
-        success: bool = veertu_mngr.add_port_forwarding(
+        success: bool = veertu_mngr().add_port_forwarding(
             vm_id, rule_name, host_ip, str(host_port), guest_ip, str(guest_port), protocol=protocol
         )
-        cli_fmt.format_added_port_forwarding_rule(success)
+        fmt.format_added_port_forwarding_rule(success)
     except VeertuManagerException as e: # Catches VMNotFound if manager raises it
-        cli_fmt.echo_status_failure(message=str(e))
+        fmt.echo_status_failure(message=str(e))
     except Exception as e: # Other unexpected errors
-        cli_fmt.echo_status_failure(message=f"An unexpected error occurred: {str(e)}")
+        fmt.echo_status_failure(message=f"An unexpected error occurred: {str(e)}")
 
 
 @add.command(name="network-card", help="Add a network card.")
@@ -552,20 +639,22 @@ def add_port_forwarding_rule(
 @click.option('--type', 'nic_type', type=click.Choice(['shared', 'host', 'disconnected']), default='shared', show_default=True)
 @click.option('--model', type=click.Choice(['e1000', 'rtl8139']), default='e1000', show_default=True)
 def add_network_card_to_vm(ctx: click.Context, nic_type: str, model: str) -> None:
+    fmt = _fmt()
     vm_id: str = ctx.obj.vm_id # type: ignore
 
     try:
-        success: bool = veertu_mngr.add_network_card(vm_id, nic_type, model)
-        cli_fmt.format_add_network_card(success)
+        success: bool = veertu_mngr().add_network_card(vm_id, nic_type, model)
+        fmt.format_add_network_card(success)
     except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
+        fmt.echo_status_failure(message=str(e))
 
 
 @modify.group(name="delete", help="Delete components or configuration from a VM.")
 @click.pass_context
 def delete_modify_items(ctx: click.Context) -> None:
-    if not isinstance(ctx.obj, CliContext) or ctx.obj.vm_id is None:
-        cli_fmt.echo_status_failure(message="VM ID not found in context for 'delete' commands. Internal error.")
+    fmt = _fmt()
+    if cast(CliContext, ctx.obj).vm_id is None:
+        fmt.echo_status_failure(message="VM ID not found in context for 'delete' commands. Internal error.")
         ctx.exit(1)
 
 
@@ -573,59 +662,65 @@ def delete_modify_items(ctx: click.Context) -> None:
 @click.pass_context
 @click.argument('rule_name', type=str)
 def delete_port_forwarding_rule(ctx: click.Context, rule_name: str) -> None:
+    fmt = _fmt()
     vm_id: str = ctx.obj.vm_id # type: ignore
 
     try:
-        success: bool = veertu_mngr.remove_port_forwarding(vm_id, rule_name)
-        cli_fmt.format_deleted_port_forwarding_rule(success)
+        success: bool = veertu_mngr().remove_port_forwarding(vm_id, rule_name)
+        fmt.format_deleted_port_forwarding_rule(success)
     except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
+        fmt.echo_status_failure(message=str(e))
 
 
 @delete_modify_items.command('network-card', help="Delete a network card by its index.")
 @click.pass_context
 @click.argument('card_index', type=str) # Manager might expect string index
 def delete_network_card_from_vm(ctx: click.Context, card_index: str) -> None:
+    fmt = _fmt()
     vm_id: str = ctx.obj.vm_id # type: ignore
     try:
-        success: bool = veertu_mngr.delete_network_card(vm_id, card_index)
-        cli_fmt.format_delete_network_card(success)
+        success: bool = veertu_mngr().delete_network_card(vm_id, card_index)
+        fmt.format_delete_network_card(success)
     except VeertuManagerException as e:
-        cli_fmt.echo_status_failure(message=str(e))
-
-# Add commands to main group
-main.add_command(list_vms)
-main.add_command(show)
-main.add_command(start)
-main.add_command(pause)
-main.add_command(shutdown)
-main.add_command(reboot)
-main.add_command(delete_vm)
-main.add_command(export)
-main.add_command(import_vm)
-main.add_command(describe)
-main.add_command(modify)
-main.add_command(create_vm)
-
-def cli_entry_point() -> None:
-    """Main entry point for the Veertu CLI."""
-    global cli_fmt # Access global cli_fmt for exception handling
+        fmt.echo_status_failure(message=str(e))
+
+@lru_cache(maxsize=1)
+def _get_main() -> click.Group:
+    """Returns the `main` group with every subcommand registered, once per process."""
+    for command in (list_vms, show, start, pause, shutdown, reboot, delete_vm,
+                    export, import_vm, describe, modify, create_vm):
+        main.add_command(command)
+    return main
+
+
+def cli_entry_point(argv: Optional[List[str]] = None) -> None:
+    """Main entry point for the Veertu CLI.
+
+    ``argv`` defaults to ``sys.argv[1:]``. Scripts that issue many commands can pass
+    it explicitly and dispatch in-process instead of paying interpreter start-up and
+    imports for every call.
+    """
+    args = sys.argv[1:] if argv is None else argv
+    cli_ctx = CliContext()
+    cli_ctx.skip_handshake = '--help' in args
     try:
         # standalone_mode=False is good for testing, ensures Click doesn't call sys.exit()
-        main(standalone_mode=False)
+        _get_main()(args=args, standalone_mode=False, obj=cli_ctx)
     except VeertuAppNotFoundException as e:
-        # Use the current cli_fmt, which might be JsonFormatter if --machine-readable was used
+        # Looked up here, after main ran: JsonFormatter if --machine-readable was used
         error_msg = str(e) if str(e) else 'Veertu app not found. Please check configuration.'
-        cli_fmt.echo_status_failure(message=error_msg)
+        _fmt().echo_status_failure(message=error_msg)
         # Consider sys.exit(app_not_found_exit_code) here if not using standalone_mode=False
     except VeertuManagerException as e: # For other known manager issues
-        cli_fmt.echo_status_failure(message=str(e))
+        _fmt().echo_status_failure(message=str(e))
     except click.exceptions.Abort: # User aborted a click.confirm()
         # For Abort, it's common to output a specific message or just exit quietly
-        cli_fmt.echo_status_failure(message="Operation aborted by user.")
+        _fmt().echo_status_failure(message="Operation aborted by user.")
     except Exception as e: # Catch-all for any other unexpected errors
         # Provide a generic error message but include specifics for debugging
-        cli_fmt.echo_status_failure(message=f"An unexpected error occurred: {type(e).__name__} - {str(e)}")
+        _fmt().echo_status_failure(message=f"An unexpected error occurred: {type(e).__name__} - {str(e)}")
+    finally:
+        _fmt().flush()
 
 
 if __name__ == '__main__':
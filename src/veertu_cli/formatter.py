@@ -1,10 +1,29 @@
+import io
 import json
-from collections import OrderedDict
-from typing import Any, Dict, List, Optional, Union, Tuple
+import os
+import sys
+import threading
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, BinaryIO, Callable, ClassVar, Dict, List, Optional, Union, Tuple
 
 import click
+import tabulate as _tabulate_module
 from tabulate import tabulate
 
+try:
+    import orjson # Optional (the `fast` extra); much quicker than json for --machine-readable output
+except ImportError:
+    orjson = None # type: ignore[assignment]
+
+
+def _dumps(obj: Any) -> str:
+    # Both encoders produce the same compact UTF-8 text, so output does not depend on the extra.
+    # (One function rather than two conditional definitions, which mypyc cannot compile.)
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
 
 # Using TypeAlias for complex types if available (Python 3.10+)
 # from typing import TypeAlias
@@ -16,8 +35,156 @@ DictStrAny = Dict[str, Any]
 ListDictStrAny = List[Dict[str, Any]]
 
 
+def _values_getter(keys: Tuple[Any, ...]) -> Callable[[DictStrAny], Tuple[Any, ...]]:
+    """Returns a function extracting ``keys`` from a row as a tuple, in one C-level call."""
+    if len(keys) > 1:
+        return itemgetter(*keys)
+    # itemgetter with a single key returns the bare value, and with none it cannot be built.
+    return lambda row: tuple(row[k] for k in keys)
+
+
+# Shared body for responses that carry none; only ever serialized, never mutated.
+_EMPTY_BODY: DictStrAny = {}
+
+# Bare OK/ERROR responses are constant, so they are encoded once rather than per call.
+_EMPTY_RESPONSES: Dict[str, str] = {
+    status: _dumps({'status': status, 'body': {}, 'message': ''}) for status in ('OK', 'ERROR')
+}
+
+
+# Envelope around the VM array when `list` output is streamed; same bytes as _dumps would give.
+_LIST_HEAD, _, _LIST_TAIL = _dumps({'status': 'OK', 'body': {'vms': []}, 'message': ''}).encode('utf-8').partition(b'[]')
+
+
+# Per-thread StringIO reused across CliFormatter.format_dict calls.
+_buf_pool = threading.local()
+
+# VDHH_FAST_GRID=0 sends every table through tabulate, e.g. to compare output.
+_FAST_GRID = os.environ.get('VDHH_FAST_GRID', '1') != '0'
+
+
+# tabulate's own number tests (private helpers), so '1,024' counts as numeric exactly when
+# tabulate thinks so; float() below covers versions that lack them.
+_TABULATE_NUMBER_TESTS = tuple(getattr(_tabulate_module, name) for name in
+                               ('_isnumber', '_isnumber_with_thousands_separator')
+                               if hasattr(_tabulate_module, name))
+
+
+def _is_plain_cell(cell: str) -> bool:
+    """True for text tabulate would left-align and measure one column per character."""
+    if not (cell.isascii() and cell.isprintable()) or cell != cell.strip():
+        return False
+    if any(is_number(cell) for is_number in _TABULATE_NUMBER_TESTS):
+        return False # tabulate right/decimal-aligns anything numeric
+    try:
+        float(cell)
+    except ValueError:
+        return True
+    return False
+
+
+def _fast_grid(headers: Tuple[str, ...], rows: Tuple[Tuple[str, ...], ...]) -> Optional[str]:
+    """Draws tabulate's 'grid' layout for tables of plain cells; None when tabulate is needed."""
+    if not rows or not rows[0]:
+        return None
+    ncols = len(rows[0])
+    if (headers and len(headers) != ncols) or any(len(row) != ncols for row in rows):
+        return None
+    if not all(map(_is_plain_cell, headers)) or not all(_is_plain_cell(c) for row in rows for c in row):
+        return None
+
+    widths = [max(map(len, col)) for col in zip(*rows)]
+    if headers: # tabulate keeps two spaces of slack after each header
+        widths = [max(w, len(h) + 2) for w, h in zip(widths, headers)]
+    sep = '+' + '+'.join('-' * (w + 2) for w in widths) + '+'
+
+    def line(cells: Tuple[str, ...]) -> str:
+        return '| ' + ' | '.join(c.ljust(w) for c, w in zip(cells, widths)) + ' |'
+
+    lines = [sep]
+    if headers:
+        lines.append(line(headers))
+        lines.append(sep.replace('-', '='))
+    for row in rows:
+        lines.append(line(row))
+        lines.append(sep)
+    return '\n'.join(lines)
+
+
+@lru_cache(maxsize=32)
+def _render_grid(headers: Tuple[str, ...], rows: Tuple[Tuple[str, ...], ...]) -> str:
+    """Renders a grid table; repeated renders of the same data (polling, watch loops) are free."""
+    if _FAST_GRID:
+        fast = _fast_grid(headers, rows)
+        if fast is not None:
+            return fast
+    return tabulate(rows, headers=headers, tablefmt='grid')
+
+
+# How CliFormatter.format_dict places each value: scalars go into the dict's own table,
+# dicts and lists of dicts become sections of their own below it.
+def _add_str(fmt: 'CliFormatter', key: str, v: Any, data: List[Tuple[str, str]], additionals: DictStrAny) -> None:
+    data.append((key, v))
+
+
+def _add_section(fmt: 'CliFormatter', key: str, v: Any, data: List[Tuple[str, str]], additionals: DictStrAny) -> None:
+    additionals[key] = v
+
+
+def _add_list(fmt: 'CliFormatter', key: str, v: Any, data: List[Tuple[str, str]], additionals: DictStrAny) -> None:
+    if len(v) > 0 and isinstance(v[0], dict):
+        # This list contains dicts, format it as a table string
+        additionals[key] = fmt.format_list_of_dicts(v)
+    else:
+        data.append((key, ', '.join(map(str, v))))
+
+
+def _add_other(fmt: 'CliFormatter', key: str, v: Any, data: List[Tuple[str, str]], additionals: DictStrAny) -> None:
+    data.append((key, str(v)))
+
+
+# Exact-type lookup for the common cases; anything else goes through _value_handler_for.
+_VALUE_HANDLERS: Dict[type, Callable[..., None]] = {
+    str: _add_str, dict: _add_section, list: _add_list,
+    int: _add_other, float: _add_other, bool: _add_other, type(None): _add_other,
+}
+
+
+def _value_handler_for(v: Any) -> Callable[..., None]:
+    # Subclasses resolve with the same precedence the handlers table encodes.
+    if isinstance(v, str):
+        return _add_str
+    if isinstance(v, dict):
+        return _add_section
+    if isinstance(v, list):
+        return _add_list
+    return _add_other
+
+
 class AbstractFormatter(object):
 
+    # Per-VM action messages, keyed by whether the action succeeded (and, for start, restart).
+    _START_MESSAGES: ClassVar[Dict[Tuple[bool, bool], str]] = {
+        (True, False): "VM {vm} successfully started",
+        (True, True): "VM {vm} successfully restarted",
+        (False, False): "VM {vm} failed to start",
+        (False, True): "VM {vm} failed to restart",
+    }
+    _PAUSE_MESSAGES: ClassVar[Dict[bool, str]] = {True: "VM {vm} paused", False: "VM {vm} failed to pause"}
+    _SHUTDOWN_MESSAGES: ClassVar[Dict[bool, str]] = {
+        True: "VM {vm} is shutting down",
+        False: "VM {vm} was unable to shut down (you can try with --force)",
+    }
+    _REBOOT_MESSAGES: ClassVar[Dict[bool, str]] = {
+        True: "VM {vm} is rebooting",
+        False: "VM {vm} was unable to reboot (you can try with --force)",
+    }
+    _DELETE_MESSAGES: ClassVar[Dict[bool, str]] = {True: "VM {vm} deleted successfully", False: "Unable to delete VM {vm} "}
+
+    @staticmethod
+    def _vm_message(template: str, vm_id: Optional[str]) -> str:
+        return template.format(vm=vm_id if vm_id is not None else "Unknown VM")
+
     def format_list_output(self, vms_list: ListDictStrAny) -> None:
         pass
 
@@ -69,58 +236,63 @@ class AbstractFormatter(object):
     def format_delete_network_card(self, success: bool) -> None:
         pass
 
+    def flush(self) -> None:
+        pass
+
 
 class CliFormatter(AbstractFormatter):
 
+    # Table renderer (headers, rows) -> str; a subclass can swap in a different one.
+    _render_grid = staticmethod(_render_grid)
+
     def format_list_of_dicts(self, list_of_dicts: ListDictStrAny) -> str:
         if isinstance(list_of_dicts, list) and len(list_of_dicts) > 0:
-            # Ensure all keys are strings for headers
-            headers = {str(k): str(k) for k in list_of_dicts[0].keys()}
-            # Ensure all values are suitable for tabulate (mostly strings)
-            safe_list_of_dicts = []
-            for row_dict in list_of_dicts:
-                safe_row = {str(k): str(v) if v is not None else "" for k, v in row_dict.items()}
-                safe_list_of_dicts.append(safe_row)
-            return tabulate(safe_list_of_dicts, headers=headers, tablefmt='grid')
+            # Columns are every key of any row, in order of first appearance, as tabulate shows them.
+            keys = tuple(dict.fromkeys(k for row in list_of_dicts for k in row))
+            if all(len(row) == len(keys) for row in list_of_dicts): # Every row has every column
+                getter = _values_getter(keys)
+                rows = tuple(tuple("" if v is None else str(v) for v in getter(row)) for row in list_of_dicts)
+            else: # Cells of the columns a row lacks are left empty
+                rows = tuple(tuple("" if (v := row.get(k)) is None else str(v) for k in keys) for row in list_of_dicts)
+            return self._render_grid(tuple(str(k) for k in keys), rows)
         return ""
 
     def format_dict(self, dict_to_output: DictStrAny) -> str:
-        output = ''
-        data: List[Tuple[str, str]] = [] # Explicitly type 'data'
-        additionals: Dict[str, Union[str, DictStrAny, ListDictStrAny]] = {}
-
         if not isinstance(dict_to_output, dict):
             return ""
 
-        for k, v in dict_to_output.items():
-            key_str = str(k) # Ensure key is string
-            if isinstance(v, str):
-                data.append((key_str, v))
-            elif isinstance(v, (dict, OrderedDict)):
-                additionals[key_str] = v # Store as is, will be formatted recursively or by format_list_of_dicts
-            elif isinstance(v, list):
-                if len(v) > 0 and isinstance(v[0], (dict, OrderedDict)):
-                    # This list contains dicts, format it as a table string
-                    additionals[key_str] = self.format_list_of_dicts(v)
-                else:
-                    data.append((key_str, ', '.join(map(str, v))))
-            else:
-                data.append((key_str, str(v)))
-
-        if data: # Only call tabulate if data is not empty
-            output += tabulate(data, tablefmt='grid')
-            output += '\n\n'
-
-        for k, v_item in additionals.items():
-            output += k + "\n\n"
-            if isinstance(v_item, dict): # This should be DictStrAny from earlier check
-                output += self.format_dict(v_item)
-            elif isinstance(v_item, str): # This means it's already formatted list of dicts
-                 output += v_item
-            # Note: if v_item is ListDictStrAny, it's an unhandled case here,
-            # but format_list_of_dicts should have turned it into a string.
-            output += '\n\n'
-        return output
+        # Reuse this thread's buffer; it is taken out of the pool while in use so a
+        # nested call (e.g. from a subclass) gets a fresh one instead of sharing it.
+        buf = getattr(_buf_pool, 'buf', None) or io.StringIO()
+        _buf_pool.buf = None
+        # Dicts still to render and text ready to write, popped depth-first so nested
+        # sections come out in the same order a recursive walk would produce.
+        stack: List[Union[str, DictStrAny]] = [dict_to_output]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                buf.write(item)
+                continue
+
+            data: List[Tuple[str, str]] = []
+            additionals: Dict[str, Union[str, DictStrAny]] = {}
+            for k, v in item.items():
+                handler = _VALUE_HANDLERS.get(type(v)) or _value_handler_for(v)
+                handler(self, str(k), v, data, additionals)
+
+            if data: # One table for all of this dict's scalar pairs
+                buf.write(self._render_grid((), tuple(data)))
+                buf.write('\n\n')
+
+            for k, v_item in reversed(list(additionals.items())):
+                stack.append('\n\n')
+                stack.append(v_item)
+                stack.append(k + '\n\n')
+        result = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        _buf_pool.buf = buf
+        return result
 
     def format_list_output(self, vms_list: ListDictStrAny) -> None:
         click.echo('list of vms:')
@@ -135,45 +307,20 @@ class CliFormatter(AbstractFormatter):
         click.echo(self.format_list_of_dicts(info))
 
     def format_start_output(self, result: bool, restart: bool = False, vm_id: Optional[str] = None) -> None:
-        vm_id_str = vm_id if vm_id is not None else "Unknown VM"
-        if result:
-            if restart:
-                click.echo(f"VM {vm_id_str} successfully restarted")
-            else:
-                click.echo(f"VM {vm_id_str} successfully started")
-        else:
-            if restart:
-                click.echo(f"VM {vm_id_str} failed to restart", err=True)
-            else:
-                click.echo(f"VM {vm_id_str} failed to start", err=True)
+        template = self._START_MESSAGES[bool(result), bool(restart)]
+        click.echo(self._vm_message(template, vm_id), err=not result)
 
     def format_pause_output(self, result: bool, vm_id: Optional[str]) -> None:
-        vm_id_str = vm_id if vm_id is not None else "Unknown VM"
-        if result:
-            click.echo(f"VM {vm_id_str} paused")
-        else:
-            click.echo(f"VM {vm_id_str} failed to pause", err=True)
+        click.echo(self._vm_message(self._PAUSE_MESSAGES[bool(result)], vm_id), err=not result)
 
     def format_shutdown_output(self, result: bool, vm_id: Optional[str]) -> None:
-        vm_id_str = vm_id if vm_id is not None else "Unknown VM"
-        if result:
-            click.echo(f"VM {vm_id_str} is shutting down")
-        else:
-            click.echo(f"VM {vm_id_str} was unable to shut down (you can try with --force)", err=True)
+        click.echo(self._vm_message(self._SHUTDOWN_MESSAGES[bool(result)], vm_id), err=not result)
 
     def format_reboot_output(self, result: bool, vm_id: Optional[str]) -> None:
-        vm_id_str = vm_id if vm_id is not None else "Unknown VM"
-        if result:
-            click.echo(f"VM {vm_id_str} is rebooting")
-        else:
-            click.echo(f"VM {vm_id_str} was unable to reboot (you can try with --force)", err=True)
+        click.echo(self._vm_message(self._REBOOT_MESSAGES[bool(result)], vm_id), err=not result)
 
     def format_delete_output(self, result: bool, vm_id: Optional[str]) -> None:
-        vm_id_str = vm_id if vm_id is not None else "Unknown VM"
-        if result:
-            click.echo(f"VM {vm_id_str} deleted successfully")
-        else:
-            click.echo(f"Unable to delete VM {vm_id_str} ", err=True)
+        click.echo(self._vm_message(self._DELETE_MESSAGES[bool(result)], vm_id), err=not result)
 
     def format_vm_not_exist(self) -> None:
         click.echo('vm does not exist')
@@ -189,14 +336,15 @@ class CliFormatter(AbstractFormatter):
             click.echo(message)
 
     def format_properties_changed(self, succeeded: DictStrAny, failed: DictStrAny) -> None:
+        lines: List[str] = []
         if succeeded:
-            click.echo("the following properties were set successfully:")
-            for k, v in succeeded.items():
-                click.echo(f"{k} set to {str(v)}")
+            lines.append("the following properties were set successfully:")
+            lines.extend(f"{k} set to {v}" for k, v in succeeded.items())
         if failed:
-            click.echo('the following properties failed to set:')
-            for k, v in failed.items():
-                click.echo(f"{k} to {str(v)}")
+            lines.append('the following properties failed to set:')
+            lines.extend(f"{k} to {v}" for k, v in failed.items())
+        if lines: # One write for the whole report
+            click.echo('\n'.join(lines))
 
     def format_added_port_forwarding_rule(self, result: bool) -> None:
         if result:
@@ -234,28 +382,61 @@ class CliFormatter(AbstractFormatter):
 
 class JsonFormatter(AbstractFormatter):
 
-    def _make_response(self, status: str = "OK", body: DictStrAny = {}, message: str = '') -> DictStrAny:
+    # Longer VM lists are encoded one VM at a time rather than as a single string.
+    _STREAM_LIST_THRESHOLD: ClassVar[int] = 256
+
+    def __init__(self) -> None:
+        # Responses go straight to the binary stdout buffer and are flushed once per
+        # dispatch (see cli_entry_point) instead of on every record like click.echo.
+        self._out: Optional[BinaryIO] = getattr(sys.stdout, 'buffer', None)
+
+    def _write(self, text: str) -> None:
+        if self._out is None: # stdout replaced by a text-only stream
+            click.echo(text)
+            return
+        self._out.write(text.encode('utf-8') + b'\n')
+
+    def flush(self) -> None:
+        if self._out is not None:
+            self._out.flush()
+
+    def _make_response(self, status: str = "OK", body: Optional[DictStrAny] = None, message: str = '') -> DictStrAny:
         response: DictStrAny = {
             'status': status,
-            'body': body,
+            'body': body if body is not None else _EMPTY_BODY,
             'message': message
         }
         return response
 
     def _format_to_json(self, response: DictStrAny) -> str:
-        return json.dumps(response)
+        return _dumps(response)
 
-    def echo_response(self, body: DictStrAny = {}, status: str = 'OK', message: str = '', err: bool = False) -> None:
+    def echo_response(self, body: Optional[DictStrAny] = None, status: str = 'OK', message: str = '', err: bool = False) -> None:
         if err:
             status = "ERROR"
+        if not body and not message and status in _EMPTY_RESPONSES:
+            self._write(_EMPTY_RESPONSES[status])
+            return
         # Ensure body is a valid dict for _make_response
-        current_body = body if isinstance(body, dict) else {}
+        current_body = body if isinstance(body, dict) else _EMPTY_BODY
         response_dict = self._make_response(status=status, body=current_body, message=message)
-        click.echo(self._format_to_json(response_dict))
+        self._write(self._format_to_json(response_dict))
 
     def format_list_output(self, vms_list: ListDictStrAny) -> None:
+        out = self._out
+        if out is not None and len(vms_list) > self._STREAM_LIST_THRESHOLD:
+            self._stream_list(out, vms_list)
+            return
         self.echo_response(body={'vms': vms_list}) # Wrap list in a dict for consistent body structure
 
+    def _stream_list(self, out: BinaryIO, vms_list: ListDictStrAny) -> None:
+        out.write(_LIST_HEAD + b'[')
+        for i, vm in enumerate(vms_list):
+            if i:
+                out.write(b',')
+            out.write(_dumps(vm).encode('utf-8'))
+        out.write(b']' + _LIST_TAIL + b'\n')
+
     def format_show_output(self, vm_info: DictStrAny) -> None:
         self.echo_response(body=vm_info)
 
@@ -263,45 +444,20 @@ class JsonFormatter(AbstractFormatter):
         self.echo_response(body={'port_forwarding_rules': info})
 
     def format_start_output(self, result: bool, restart: bool = False, vm_id: Optional[str] = None) -> None:
-        vm_id_str = vm_id if vm_id is not None else "Unknown VM"
-        if result:
-            if restart:
-                self.echo_response(message=f"VM {vm_id_str} successfully restarted")
-            else:
-                self.echo_response(message=f"VM {vm_id_str} successfully started")
-        else:
-            if restart:
-                self.echo_response(message=f"VM {vm_id_str} failed to restart", err=True)
-            else:
-                self.echo_response(message=f"VM {vm_id_str} failed to start", err=True)
+        template = self._START_MESSAGES[bool(result), bool(restart)]
+        self.echo_response(message=self._vm_message(template, vm_id), err=not result)
 
     def format_pause_output(self, result: bool, vm_id: Optional[str]) -> None:
-        vm_id_str = vm_id if vm_id is not None else "Unknown VM"
-        if result:
-            self.echo_response(message=f"VM {vm_id_str} paused")
-        else:
-            self.echo_response(message=f"VM {vm_id_str} failed to pause", err=True)
+        self.echo_response(message=self._vm_message(self._PAUSE_MESSAGES[bool(result)], vm_id), err=not result)
 
     def format_shutdown_output(self, result: bool, vm_id: Optional[str]) -> None:
-        vm_id_str = vm_id if vm_id is not None else "Unknown VM"
-        if result:
-            self.echo_response(message=f"VM {vm_id_str} is shutting down")
-        else:
-            self.echo_response(message=f"VM {vm_id_str} was unable to shut down (you can try with --force)", err=True)
+        self.echo_response(message=self._vm_message(self._SHUTDOWN_MESSAGES[bool(result)], vm_id), err=not result)
 
     def format_reboot_output(self, result: bool, vm_id: Optional[str]) -> None:
-        vm_id_str = vm_id if vm_id is not None else "Unknown VM"
-        if result:
-            self.echo_response(message=f"VM {vm_id_str} is rebooting")
-        else:
-            self.echo_response(message=f"VM {vm_id_str} was unable to reboot (you can try with --force)", err=True)
+        self.echo_response(message=self._vm_message(self._REBOOT_MESSAGES[bool(result)], vm_id), err=not result)
 
     def format_delete_output(self, result: bool, vm_id: Optional[str]) -> None:
-        vm_id_str = vm_id if vm_id is not None else "Unknown VM"
-        if result:
-            self.echo_response(message=f"VM {vm_id_str} deleted successfully")
-        else:
-            self.echo_response(message=f"Unable to delete VM {vm_id_str} ", err=True)
+        self.echo_response(message=self._vm_message(self._DELETE_MESSAGES[bool(result)], vm_id), err=not result)
 
     def format_vm_not_exist(self) -> None:
         self.echo_response(message="vm does not exist", err=True)
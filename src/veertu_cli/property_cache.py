@@ -0,0 +1,98 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .utils import cache_dir
+
+
+class PropertyCache(object):
+    """
+    VM property values shared between CLI invocations, kept in a small SQLite file under
+    cache_dir(). Values are served for TTL seconds; any write to a VM empties the cache,
+    since the same VM may have been cached under its id and under its name.
+    Rows are also tied to an epoch string (the manager passes the Veertu.app bundle's
+    modification time), so updating the app drops everything cached before.
+    The cache is an optimisation: every storage error just disables it for the process.
+    """
+    TTL = 5.0
+    # Rows older than this are deleted when the database is opened.
+    _PURGE_AGE = 60.0
+    # Bumped whenever the table layout changes; older databases are recreated.
+    _SCHEMA_VERSION = 1
+
+    def __init__(self, path: Optional[str] = None, epoch: Optional[Callable[[], str]] = None) -> None:
+        self._path = path or os.path.join(cache_dir(), 'props.sqlite')
+        self._epoch = epoch or (lambda: '')
+        self._db: Any = None
+        self._current_epoch: Optional[str] = None # Evaluated once, on first use
+        self._broken = False
+        # apply_bulk may read and write from worker threads
+        self._lock = threading.Lock()
+
+    def _connect(self) -> Any:
+        if self._db is None and not self._broken:
+            import sqlite3 # Only paid for by invocations that read properties
+            try:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                db = sqlite3.connect(self._path, timeout=1.0, check_same_thread=False)
+                if db.execute('PRAGMA user_version').fetchone()[0] != self._SCHEMA_VERSION:
+                    db.execute('DROP TABLE IF EXISTS props')
+                    db.execute('PRAGMA user_version = {:d}'.format(self._SCHEMA_VERSION))
+                db.execute('CREATE TABLE IF NOT EXISTS props (vm_id TEXT, reference TEXT, value TEXT, ts REAL,'
+                           ' epoch TEXT, PRIMARY KEY (vm_id, reference))')
+                # Rows from another epoch can never be served, so they go with the stale ones
+                db.execute('DELETE FROM props WHERE ts < ? OR epoch != ?',
+                           (time.time() - self._PURGE_AGE, self._epoch_key()))
+                db.commit()
+                self._db = db
+            except (OSError, sqlite3.Error):
+                self._broken = True
+        return self._db
+
+    def _epoch_key(self) -> str:
+        if self._current_epoch is None:
+            self._current_epoch = self._epoch()
+        return self._current_epoch
+
+    def _run(self, sql: str, params: Any = (), many: bool = False) -> List[Any]:
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return []
+            import sqlite3
+            try:
+                cursor = db.executemany(sql, params) if many else db.execute(sql, params)
+                rows: List[Any] = cursor.fetchall()
+                db.commit()
+                return rows
+            except sqlite3.Error:
+                self._broken = True
+                self._db = None
+                db.close()
+                return []
+
+    def get(self, vm_id: str, references: List[str]) -> Dict[str, str]:
+        """Returns the fresh cached values among `references` of a VM, by reference."""
+        placeholders = ', '.join('?' * len(references))
+        rows = self._run('SELECT reference, value FROM props WHERE vm_id = ? AND ts > ? AND epoch = ?'
+                         ' AND reference IN ({})'.format(placeholders),
+                         [vm_id, time.time() - self.TTL, self._epoch_key()] + list(references))
+        return dict(rows)
+
+    def put(self, vm_id: str, values: Dict[str, str]) -> None:
+        now = time.time()
+        self._run('INSERT OR REPLACE INTO props VALUES (?, ?, ?, ?, ?)',
+                  [(vm_id, reference, value, now, self._epoch_key()) for reference, value in values.items()],
+                  many=True)
+
+    def clear(self) -> None:
+        if self._db is None and not os.path.exists(self._path):
+            return # Nothing cached yet; do not create the database just to empty it
+        self._run('DELETE FROM props')
+
+    def close(self) -> None:
+        with self._lock:
+            db, self._db = self._db, None
+        if db is not None:
+            db.close()
@@ -1,9 +1,14 @@
 import os
+from functools import lru_cache
 
 
+@lru_cache(maxsize=32)
 def name_from_file_path(file_path: str) -> str:
-    d, f = os.path.split(file_path)
-    name = f
-    if '.' in name:
-        name = name.split('.').pop(0)
-    return name
+    # Everything before the first dot, so 'vm.tar.gz' gives 'vm', not 'vm.tar'.
+    return os.path.basename(file_path).partition('.')[0]
+
+
+def cache_dir() -> str:
+    """Returns the per-user cache directory for the CLI; callers create it on write."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'veertu')
@@ -1,26 +1,27 @@
+import atexit
+import errno
 import os
-try:
-    import ConfigParser # Python 2
-except ImportError:
-    import configparser as ConfigParser # Python 3
-import subprocess
-# import uuid # uuid is imported but not used
-from collections import OrderedDict
-import tarfile
+from functools import lru_cache
+import re
+import threading
 import time
-# import shutil # shutil is imported but not used
-import plistlib
 from typing import (
-    Any, Dict, List, Optional, Union, Sequence, Tuple, TypeVar, Callable, Type
+    TYPE_CHECKING, Any, Dict, List, Optional, Union, Sequence, Tuple, TypeVar, Callable, Type, cast
 )
 
+from .property_cache import PropertyCache
+from .utils import cache_dir, name_from_file_path
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
 # For older Python versions (pre-3.8), use typing_extensions for Literal if needed for stricter choices.
 # from typing_extensions import Literal
 
 # Define common type aliases for clarity
 DictStrAny = Dict[str, Any]
 ListDictStrAny = List[Dict[str, Any]]
-ProjectionType = OrderedDict[str, bool] # Projection is an OrderedDict mapping key (str) to a boolean (include in result)
+ProjectionType = Dict[str, bool] # Projection maps key (str) to a boolean (include in result), in output order
 
 # Type variable for VeertuManager methods that can return different types based on kwargs
 _T = TypeVar('_T')
@@ -62,80 +63,413 @@ class VeertuAppNotFoundException(VeertuManagerException):
     pass
 
 
+# AppleEvent errors meaning the target app is missing (kLSApplicationNotFoundErr) or not running (procNotFound).
+_APP_NOT_FOUND_ERRORS = (-10814, -600)
+
+
+# An absolute path plus close_fds=False lets subprocess launch osascript with posix_spawn
+# instead of fork+exec. Nothing is leaked: Python creates descriptors non-inheritable.
+_OSASCRIPT = '/usr/bin/osascript'
+
+
+@lru_cache(maxsize=1)
+def _subprocess() -> Any:
+    """Imports subprocess on first use; the OSAKit path never needs it."""
+    import subprocess
+    return subprocess
+
+
+@lru_cache(maxsize=1)
+def _osakit() -> Any:
+    """Returns PyObjC's OSAKit module if installed (the `macos` extra), else None."""
+    try:
+        import OSAKit
+    except ImportError:
+        return None
+    return OSAKit
+
+
+def _compile_osa_script(source: str) -> Any:
+    """
+    Compiles an AppleScript source in-process with OSAKit. Returns None if OSAKit cannot
+    compile it, so the caller can hand it to osascript instead.
+    """
+    osakit = _osakit()
+    script = osakit.OSAScript.alloc().initWithSource_language_(
+        source, osakit.OSALanguage.languageForName_('AppleScript'))
+    if script is None:
+        return None
+    compiled, _ = script.compileAndReturnError_(None)
+    return script if compiled else None
+
+
+# VDHH_OSASCRIPT_SESSION=1 runs one-line scripts through a single long-lived `osascript -i`
+# process instead of spawning osascript per command (only used when OSAKit is unavailable).
+_OSASCRIPT_SESSION = os.environ.get('VDHH_OSASCRIPT_SESSION', '0') == '1'
+
+
+def _from_applescript_source(text: str) -> str:
+    """
+    Converts a value as `osascript -i` echoes it (source form: quoted strings, {...} lists) to the
+    text `osascript -e` prints for it, e.g. '{"a", missing value}' -> 'a, missing value'.
+    """
+    escapes = {'n': '\n', 'r': '\r', 't': '\t'}
+    out: List[str] = []
+    in_string = False
+    chars = iter(text)
+    for char in chars:
+        if in_string:
+            if char == '\\':
+                escaped = next(chars, '')
+                out.append(escapes.get(escaped, escaped))
+            elif char == '"':
+                in_string = False
+            else:
+                out.append(char)
+        elif char == '"':
+            in_string = True
+        elif char not in '{}':
+            out.append(char)
+    return ''.join(out)
+
+
+class _OsascriptSession(object):
+    """
+    A persistent `osascript -i` interpreter fed one single-line script at a time over stdin.
+    Each script is followed by a sentinel string expression; everything the interpreter prints
+    before the sentinel's result belongs to the script. Results are echoed in source form and
+    converted to what `osascript -e` would print. Any protocol surprise, or no answer within
+    TIMEOUT seconds, raises OSError so the caller can drop the session and spawn osascript normally.
+    """
+    _SENTINEL = '--veertu-end--'
+    TIMEOUT = 60.0
+
+    def __init__(self, command: Optional[List[str]] = None) -> None:
+        subprocess = _subprocess()
+        self._proc = subprocess.Popen(command or [_OSASCRIPT, '-i'], stdin=subprocess.PIPE,
+                                      stdout=subprocess.PIPE, stderr=subprocess.STDOUT, close_fds=False)
+        self._buffer = b''
+
+    def _readline(self, deadline: float) -> bytes:
+        """Next line of output (b'' at end of file), read straight from the pipe so select() sees all of it."""
+        import select
+        fd = self._proc.stdout.fileno()
+        while b'\n' not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                self._proc.kill()
+                raise OSError('osascript session did not answer within {:g}s'.format(self.TIMEOUT))
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                line, self._buffer = self._buffer, b''
+                return line
+            self._buffer += chunk
+        line, _, self._buffer = self._buffer.partition(b'\n')
+        return line + b'\n'
+
+    def run(self, script: str) -> Tuple[str, Optional[str]]:
+        """Returns (output, error message or None) of one script."""
+        if self._proc.poll() is not None:
+            raise OSError('osascript session has exited')
+        self._proc.stdin.write('{}\n"{}"\n'.format(script, self._SENTINEL).encode('utf-8'))
+        self._proc.stdin.flush()
+        deadline = time.monotonic() + self.TIMEOUT
+        output, error = [], None
+        while True:
+            line = self._readline(deadline)
+            if not line:
+                raise OSError('osascript session closed its output')
+            text = line.decode('utf-8').rstrip('\n')
+            while text.startswith('>> '): # Prompts echoed before each statement
+                text = text[3:]
+            if text.startswith('=> '):
+                value = _from_applescript_source(text[3:])
+                if value == self._SENTINEL:
+                    break
+                output.append(value)
+            elif text.startswith('!! '):
+                error = text[3:]
+            elif text:
+                output.append(text)
+        return '\n'.join(output).strip(), error
+
+    def close(self) -> None:
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            self._proc.wait()
+
+
+def _fourcc(code: str) -> int:
+    return int.from_bytes(code.encode('ascii'), 'big')
+
+
+_DESC_LIST, _DESC_TRUE, _DESC_FALSE, _DESC_BOOLEAN, _DESC_TYPE, _DESC_NULL = (
+    _fourcc(c) for c in ('list', 'true', 'fals', 'bool', 'type', 'null'))
+_MISSING_VALUE = _fourcc('msng')
+
+
+def _descriptor_text(descriptor: Any) -> str:
+    """Renders an NSAppleEventDescriptor the way osascript prints results: list items joined by ', '."""
+    if descriptor is None:
+        return ''
+    kind = descriptor.descriptorType()
+    if kind == _DESC_LIST:
+        return ', '.join(_descriptor_text(descriptor.descriptorAtIndex_(i))
+                         for i in range(1, descriptor.numberOfItems() + 1))
+    if kind in (_DESC_TRUE, _DESC_FALSE, _DESC_BOOLEAN):
+        return 'true' if descriptor.booleanValue() else 'false'
+    if kind == _DESC_TYPE and descriptor.typeCodeValue() == _MISSING_VALUE:
+        return 'missing value'
+    if kind == _DESC_NULL:
+        return ''
+    return descriptor.stringValue() or ''
+
+
+@lru_cache(maxsize=None)
+def _projection(keys: Tuple[str, ...], included: Optional[Tuple[bool, ...]] = None) -> ProjectionType:
+    """
+    Returns the projection mapping `keys` to their include flags (all True by default).
+    Built once per distinct argument set, so callers must not modify the result.
+    """
+    if included is None:
+        included = (True,) * len(keys)
+    return dict(zip(keys, included))
+
+
+_LIST_SEPARATOR = re.compile(r'\s*,\s*')
+
+
+@lru_cache(maxsize=256)
+def _split_applescript_list(output: str) -> Tuple[str, ...]:
+    """
+    Splits osascript list output ("a, b, missing value") into stripped items, with
+    'missing value' shown as '-'. Polling repeats the same output, hence the cache.
+    """
+    output = output.replace('missing value', '-').strip()
+    if not output:
+        return ()
+    return tuple(_LIST_SEPARATOR.split(output))
+
+
+def _as_section(section: Union[str, Sequence[str], None]) -> Tuple[str, ...]:
+    """Normalizes a section argument (None, one section name or a path) to a tuple of names."""
+    if section is None:
+        return ()
+    if isinstance(section, str):
+        return (section,)
+    return tuple(section)
+
+
+@lru_cache(maxsize=128)
+def _property_reference(property_name: str, section: Tuple[str, ...]) -> str:
+    """
+    Returns '<property> of <section> ... ' (with a trailing space) for a section path
+    ordered as AppleScript writes it, most specific first.
+    """
+    return property_name + ' ' + ''.join(['of {} '.format(s) for s in section])
+
+
+@lru_cache(maxsize=64)
+def _set_property_template(property_name: str, section: Tuple[str, ...]) -> str:
+    """Builds VeertuManager._set_property_template's result once per property and section path."""
+    # set_property takes the path innermost last; reversed for AppleScript
+    return 'set {}of vm id "{{}}" to {{}}'.format(_property_reference(property_name, section[::-1]))
+
+
+# Unindented `KEY = value` lines; section headers, comments and indented continuation lines never match.
+_CONFIG_LINE = re.compile(r'^([A-Za-z_][\w.-]*)[ \t]*[=:][ \t]*(.*?)[ \t]*$', re.M)
+# The first section header other than [DEFAULT]; settings after it belong to other sections.
+_CONFIG_OTHER_SECTION = re.compile(r'^[ \t]*\[(?!DEFAULT\])', re.M)
+
+
+def _read_config(cfg_file: str) -> Dict[str, str]:
+    """
+    Reads the [DEFAULT] settings of ~/.veertu_config without configparser. Only the subset the
+    CLI needs is supported: unindented `KEY = value` (or `KEY: value`) lines before the first
+    section other than [DEFAULT]. Values are taken literally: continuation lines are ignored and
+    %-interpolation is not applied. Keys are upper-cased, as configparser would match them
+    case-insensitively.
+    """
+    try:
+        with open(cfg_file) as f:
+            text = f.read()
+    except OSError:
+        return {}
+    other_section = _CONFIG_OTHER_SECTION.search(text)
+    if other_section:
+        text = text[:other_section.start()]
+    return {key.upper(): value for key, value in _CONFIG_LINE.findall(text)}
+
+
+def _write_config(cfg_file: str, config: Dict[str, str]) -> None:
+    """Writes `config` in the format _read_config reads; only used for the CLI's own cache files."""
+    with open(cfg_file, 'w') as f:
+        f.write('[DEFAULT]\n')
+        f.writelines('{} = {}\n'.format(key, value) for key, value in config.items())
+
+
 class VeertuManager(object):
     """
     Manages interactions with the Veertu Desktop application via AppleScript (osascript).
     """
     def __init__(self) -> None:
         self.app: str = "Veertu"
-        parser: ConfigParser.SafeConfigParser = ConfigParser.SafeConfigParser()
+        # list() output is reused for a short while; mutating commands drop it.
+        self._list_cache: Optional[Tuple[float, ListDictStrAny]] = None
+        self._list_ttl: float = 2.0
+        self._name_to_id: Dict[str, str] = {}
+        # VM reference given by the caller (id or name) -> the id that worked for it.
+        self._resolved_vm_ids: Dict[str, str] = {}
+        self._osascript_session: Optional[_OsascriptSession] = None
+        # Read-only scripts currently running, so concurrent identical reads share one call.
+        self._inflight: Dict[str, 'Future[str]'] = {}
+        self._inflight_lock = threading.Lock()
+        # (vm id or name, property reference) -> (value text, time.monotonic() of the read) from
+        # get_properties; lets set_property skip writes that would not change anything right after
+        # a read. Dropped by writes to the VM.
+        self._property_values: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        # get_properties results shared with other invocations for a few seconds (see PropertyCache).
+        self.use_property_cache: bool = True
+        self._property_cache = PropertyCache(epoch=self._app_epoch)
+        # (vm id, rule name) -> description; cleared when rules are added or removed.
+        self._port_forwarding_descriptions: Dict[Tuple[str, str], str] = {}
         cfg_file: str = os.path.expanduser('~/.veertu_config')
-
-        app_name_to_use: str = self.app # Start with default
-
-        if os.path.exists(cfg_file):
-            try:
-                parser.read(cfg_file)
-                if parser.has_option('DEFAULT', 'APP_PATH'):
-                    config_app_path: Optional[str] = parser.get('DEFAULT', 'APP_PATH')
-                    if config_app_path:
-                        app_name_to_use = config_app_path
-                        if not self._verify_app_name(app_name_to_use):
-                            app_name_to_use = self._find_working_app_name_from_options(
-                                ['Veertu', 'Veertu 2016 Business', 'Veertu Desktop'],
-                                config_app_path
-                            )
-                    else:
-                        app_name_to_use = self._find_working_app_name_from_options(
-                            ['Veertu', 'Veertu 2016 Business', 'Veertu Desktop'], self.app
-                        )
-                else:
-                    app_name_to_use = self._find_working_app_name_from_options(
-                        ['Veertu', 'Veertu 2016 Business', 'Veertu Desktop'], self.app
-                    )
-            except ConfigParser.Error:
-                app_name_to_use = self._find_working_app_name_from_options(
-                    ['Veertu', 'Veertu 2016 Business', 'Veertu Desktop'], self.app
-                )
+        self._last_verified_app: Optional[str] = None
+        # App names that answered version() in this process; the app does not change under us.
+        self._answered_version: Dict[str, bool] = {}
+        # The user's config is only ever read; the verified app name is cached separately.
+        config_app_path = _read_config(cfg_file).get('APP_PATH')
+        self._config_app_path: Optional[str] = config_app_path
+        self._verified_app_file: str = os.path.join(cache_dir(), 'verified_app')
+
+        # An app name verified by an earlier run is trusted without probing; if the
+        # first command then cannot find the app, _run_osascript probes again.
+        self._app_from_cache: bool = False
+        cached_app = self._verified_app()
+        if cached_app:
+            self.app = cached_app
+            self._app_from_cache = True
+            return
+
+        if config_app_path and self._verify_app_name(config_app_path):
+            app_name_to_use = config_app_path
         else:
             app_name_to_use = self._find_working_app_name_from_options(
-                ['Veertu', 'Veertu 2016 Business', 'Veertu Desktop'], self.app
+                self._APP_NAMES, config_app_path or self.app
             )
 
         self.app = app_name_to_use
+        if self._last_verified_app == app_name_to_use:
+            self._save_verified_app(app_name_to_use)
+
+    # Application names tried, in order, when the configured one does not answer.
+    _APP_NAMES = ['Veertu', 'Veertu 2016 Business', 'Veertu Desktop']
+    # How long an app name verified by a previous run is trusted without probing.
+    _APP_VERIFIED_TTL = 24 * 60 * 60.0
+
+    def _verified_app(self) -> Optional[str]:
+        """
+        Returns the app name recorded by _save_verified_app if it was verified within
+        _APP_VERIFIED_TTL, for the APP_PATH currently configured, and the app bundle
+        has not been updated since.
+        """
+        stamp = _read_config(self._verified_app_file)
+        app_name = stamp.get('APP')
+        try:
+            verified_at = float(stamp.get('VERIFIED_AT', ''))
+        except ValueError:
+            return None
+        if not app_name or not 0 <= time.time() - verified_at < self._APP_VERIFIED_TTL:
+            return None
+        if stamp.get('CONFIG_APP_PATH', '') != (self._config_app_path or ''):
+            return None # ~/.veertu_config was edited since
+        if stamp.get('BUNDLE_MTIME', '') != self._app_bundle_mtime(app_name):
+            return None
+        return app_name
+
+    @staticmethod
+    def _app_bundle_mtime(app_name: str) -> str:
+        """Modification time of the app's Info.plist, or '' when the bundle is not in /Applications."""
+        try:
+            return repr(os.stat('/Applications/{}.app/Contents/Info.plist'.format(app_name)).st_mtime)
+        except OSError:
+            return ''
+
+    def _app_epoch(self) -> str:
+        """PropertyCache epoch: cached reads are only reused for the same Veertu.app build."""
+        return '{}@{}'.format(self.app, self._app_bundle_mtime(self.app))
+
+    def _save_verified_app(self, app_name: Optional[str]) -> None:
+        """Records (or, with app_name=None, forgets) the verified app name under cache_dir()."""
+        try:
+            if app_name:
+                os.makedirs(os.path.dirname(self._verified_app_file), exist_ok=True)
+                _write_config(self._verified_app_file, {
+                    'APP': app_name,
+                    'CONFIG_APP_PATH': self._config_app_path or '',
+                    'VERIFIED_AT': str(time.time()),
+                    'BUNDLE_MTIME': self._app_bundle_mtime(app_name),
+                })
+            elif os.path.exists(self._verified_app_file):
+                os.remove(self._verified_app_file)
+        except OSError:
+            pass # The cache is an optimisation; a read-only cache directory just means probing every run
+
+    def _reprobe_app(self) -> None:
+        """Forgets the cached app name and probes the known names again."""
+        self._app_from_cache = False
+        self._save_verified_app(None)
+        self._last_verified_app = None
+        self._answered_version.clear()
+        self.app = self._find_working_app_name_from_options(self._APP_NAMES, self.app)
+        if self._last_verified_app == self.app:
+            self._save_verified_app(self.app)
 
     def _verify_app_name(self, app_name: str) -> bool:
         """Tests if an app name is responsive by calling 'version'."""
-        original_app = self.app
-        self.app = app_name
+        probe = self._probe_app(app_name)
+        if probe:
+            self._last_verified_app = app_name
+        return probe is not False
+
+    def _probe_app(self, app_name: str) -> Optional[bool]:
+        """
+        True if `app_name` answers 'version', False if it cannot be found, and None if it was
+        found but 'version' failed. The app is present in that case, so callers treat it as
+        usable; actual command failures will be caught later.
+        """
         try:
-            self.version()
-            self.app = original_app
+            self.version(app=app_name)
             return True
         except VeertuAppNotFoundException:
-            self.app = original_app
             return False
         except VeertuManagerException: # Other errors during version() call
-            self.app = original_app # Restore app name
-            # This implies app was found but 'version' command failed.
-            # Treat as 'verified' for purposes of _find_working_app_name_from_options,
-            # as the app itself is present. Actual command failures will be caught later.
-            return True
-
+            return None
 
     def _find_working_app_name_from_options(self, options: List[str], fallback_app_name: str) -> str:
         """
-        Iterates through app names in `options`, returns the first one that works.
+        Returns the first app name in `options` that works, in list order.
         If none work, returns `fallback_app_name` (after trying to verify it too).
         """
-        for app_option in options:
-            if self._verify_app_name(app_option):
+        candidates = list(dict.fromkeys(list(options) + [fallback_app_name]))
+        if _osakit() is None and not _OSASCRIPT_SESSION:
+            # Each probe is its own osascript process, so all names are tried at once.
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+                probes = list(pool.map(self._probe_app, candidates))
+        else:
+            # OSAKit and the shared osascript session are not safe to drive from several threads.
+            probes = []
+            for app_option in candidates:
+                probes.append(self._probe_app(app_option))
+                if probes[-1] is not False:
+                    break
+        for app_option, probe in zip(candidates, probes):
+            if probe is not False:
+                if probe:
+                    self._last_verified_app = app_option
                 return app_option
 
-        # If no option worked, check if the fallback_app_name itself works
-        if self._verify_app_name(fallback_app_name):
-            return fallback_app_name
-
         # If absolutely nothing works, return the fallback_app_name.
         # The first actual command will then likely raise VeertuAppNotFoundException.
         return fallback_app_name
@@ -151,128 +485,243 @@ class VeertuManager(object):
         scalar: bool = False,
         number: bool = False,
         return_formatted: bool = True,
-        format_args: bool = True
+        app: Optional[str] = None,
+        shared: bool = False
     ) -> Any:
-        if kwargs.get('format', True):
+        # Templates are only formatted when there is something to substitute, so constant
+        # commands (and commands already formatted by the name fallback) skip str.format.
+        if args:
             command = command.format(*args)
 
         # Ensure self.app is correctly substituted if it contains spaces
-        osa_command = ['osascript', '-e', 'tell application "{}" to {}'.format(self.app.replace('"', '\\"'), command)]
-
-        try:
-            osscript_output_bytes = subprocess.check_output(osa_command, stderr=subprocess.PIPE)
-            osscript_output = osscript_output_bytes.decode('utf-8').strip() # Decode from bytes
-        except subprocess.CalledProcessError as e:
-            # Capture stderr for better error reporting
-            error_message = e.stderr.decode('utf-8').strip() if e.stderr else str(e)
-            # It's possible the app isn't found or another osascript error occurred
-            if "Application can't be found" in error_message or "Application not running" in error_message :
-                 raise VeertuAppNotFoundException('Application "{}" not found or not running. OSA Error: {}'.format(self.app, error_message))
-            raise VeertuManagerException('OSA Script execution failed for app "{}": {}. Command: {}'.format(self.app, error_message, command))
-
-
-        if kwargs.get('return_as_dict', kwargs.get('return_list_of_dicts', False)):
-            projection = kwargs.get('projection', OrderedDict()) # Ensure projection is ordered
-            return_list_of_dicts = kwargs.get('return_list_of_dicts', False)
-            list_output = self._split_and_strip(osscript_output)
-            projection_length = len(projection)
-            if projection_length == 0: # Avoid division by zero if projection is empty
-                 if not list_output or (len(list_output) == 1 and not list_output[0]): # Empty or [""]
-                     return [] if return_list_of_dicts else OrderedDict()
-                 raise WrongProjectionException('Projection is empty but received output.')
-
-            list_output_length = len(list_output)
-
-            # Handle cases where output is empty or just [""]
-            if list_output_length == 1 and not list_output[0]:
-                list_output_length = 0
-                list_output = []
-
-            if list_output_length % projection_length != 0:
-                raise WrongProjectionException('Wrong parameters passed to projection. Output length {} not divisible by projection length {}. Output: {}'.format(list_output_length, projection_length, list_output))
-
-            objects_returned = list_output_length // projection_length if projection_length > 0 else 0
-
-            if objects_returned == 0: # No objects to return
-                return [] if return_list_of_dicts else OrderedDict()
-
-            if objects_returned == 1 and not return_list_of_dicts:
-                return self._turn_into_dict(list_output, projection)
-
-            output_lists = [OrderedDict() for _ in range(objects_returned)] # Use _ for unused loop var
-
-            # Ensure projection items are iterated in order for Python < 3.7 where dicts are not ordered by default
-            # This is important because we pop from list_output
-            current_output_idx = 0
-            for _ in range(objects_returned):
-                for key, is_return in projection.items():
-                    item = list_output[current_output_idx]
-                    current_output_idx += 1
-                    if is_return: # Check if this key should be included in the result
-                        output_lists[_][key] = item # Use the loop variable _ for the current dict
-            return output_lists
-
-        osscript_output = osscript_output.strip()
-        if kwargs.get('scalar', False):
-            if self._is_int_parsed(osscript_output):
-                return bool(int(osscript_output))
-            if osscript_output.lower() == 'true':
+        # `app` targets another application name without touching self.app (used by probes)
+        quoted_app = self._quoted_app(app)
+        if '\n' in command: # Several statements need a tell block
+            script = 'tell application "{}"\n{}\nend tell'.format(quoted_app, command)
+        else:
+            script = 'tell application "{}" to {}'.format(quoted_app, command)
+        # shared=True marks read-only commands, which concurrent callers may share
+        osscript_output = self._run_shared_osascript(script) if shared else self._run_osascript(script)
+
+        if return_as_dict or return_list_of_dicts:
+            if projection is None:
+                projection = {}
+            return self._project(self._split_and_strip(osscript_output), projection, return_list_of_dicts)
+
+        # _run_osascript already returns stripped output on both the OSAKit and osascript paths.
+        if scalar:
+            lowered = osscript_output.lower()
+            if lowered == 'true':
                 return True
-            if osscript_output.lower() == 'false': # Handle 'false' string
+            if lowered == 'false': # Handle 'false' string
                 return False
+            if self._is_int_parsed(osscript_output):
+                return bool(int(osscript_output))
             return False # Default for scalar if not recognized
 
-        if kwargs.get('number', False):
+        if number:
             try:
                 return int(osscript_output)
             except ValueError:
                 raise InternalAppError('There was an internal error, your process might have succeeded. please check. Expected number, got: {}'.format(osscript_output))
 
-        if kwargs.get('return_formatted', True): # This means _split_and_strip by default
+        if return_formatted: # This means _split_and_strip by default
              return self._split_and_strip(osscript_output)
 
         return osscript_output # Return raw string if not formatted
 
-    def _is_int_parsed(self, num_str): # Renamed num to num_str
-        try:
-            int(num_str)
-            return True
-        except ValueError:
-            return False
+    def _project(self, list_output, projection, return_list_of_dicts=False):
+        """
+        Maps a flat list of AppleScript values onto `projection` keys: a single dict when the
+        output holds one object (unless return_list_of_dicts), otherwise a list of dicts.
+        """
+        projection_length = len(projection)
+        if len(list_output) == 1 and not list_output[0]: # Empty output splits into [""]
+            list_output = []
+        list_output_length = len(list_output)
+
+        if projection_length == 0: # Avoid division by zero if projection is empty
+            if not list_output:
+                return [] if return_list_of_dicts else {}
+            raise WrongProjectionException('Projection is empty but received output.')
+
+        if list_output_length % projection_length != 0:
+            raise WrongProjectionException('Wrong parameters passed to projection. Output length {} not divisible by projection length {}. Output: {}'.format(list_output_length, projection_length, list_output))
+
+        if list_output_length == 0: # No objects to return
+            return [] if return_list_of_dicts else {}
+
+        # Each object is one stride of the flat output; pair it with the keys in one pass.
+        keys = list(projection)
+        if all(projection.values()):
+            rows = [dict(zip(keys, list_output[start:start + projection_length]))
+                    for start in range(0, list_output_length, projection_length)]
+        else:
+            picked = [(offset, key) for offset, key in enumerate(keys) if projection[key]]
+            rows = [{key: list_output[start + offset] for offset, key in picked}
+                    for start in range(0, list_output_length, projection_length)]
 
-    def _turn_into_dict(self, list_output, projection):
-        output_dict = OrderedDict()
-        # Ensure projection items are iterated in order
-        list_output_idx = 0
-        for key, is_return in projection.items():
-            if list_output_idx < len(list_output):
-                item = list_output[list_output_idx]
-                list_output_idx += 1
-                if is_return:
-                    output_dict[key] = item
-            else: # Not enough items in list_output for projection
-                if is_return: # If we expected this key, mark as missing or handle error
-                    output_dict[key] = None # Or raise error
-        return output_dict
+        if len(rows) == 1 and not return_list_of_dicts:
+            return rows[0]
+        return rows
 
+    def _quoted_app(self, app: Optional[str] = None) -> str:
+        return (app or self.app).replace('"', '\\"')
+
+    def _run_osascript(self, script: str) -> str:
+        """
+        Runs an AppleScript source and returns its stripped output, as osascript would print it.
+        Uses an in-process OSAKit bridge when PyObjC provides one, otherwise spawns osascript
+        (via posix_spawn, see _OSASCRIPT).
+        """
+        try:
+            return self._execute_osascript(script)
+        except VeertuAppNotFoundException:
+            if not self._app_from_cache:
+                raise
+            stale_target = 'application "{}"'.format(self._quoted_app())
+            self._reprobe_app()
+            fresh_target = 'application "{}"'.format(self._quoted_app())
+            if fresh_target == stale_target:
+                raise
+            return self._execute_osascript(script.replace(stale_target, fresh_target))
+
+    def _run_shared_osascript(self, script: str) -> str:
+        """
+        _run_osascript for read-only scripts: a thread asking for a script that another thread
+        is already running waits for that result instead of running it again.
+        """
+        from concurrent.futures import Future
+        with self._inflight_lock:
+            running = self._inflight.get(script)
+            if running is None:
+                future: 'Future[str]' = Future()
+                self._inflight[script] = future
+        if running is not None:
+            return cast(str, running.result())
+        try:
+            future.set_result(self._run_osascript(script))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[script]
+        return cast(str, future.result())
+
+    def _execute_osascript(self, script: str) -> str:
+        if _osakit() is not None:
+            compiled = _compile_osa_script(script)
+            if compiled is not None:
+                return self._run_osakit(compiled, script)
+            # Not compilable in-process (e.g. a terminology the bridge cannot load); osascript
+            # runs it, or reports the syntax error in its usual form.
+        if _OSASCRIPT_SESSION and '\n' not in script: # `osascript -i` evaluates one line at a time
+            try:
+                output = self._run_in_session(script)
+                if output is not None:
+                    return output
+                # The script failed; rerun it standalone so the error is reported (and
+                # classified) exactly as osascript -e reports it.
+            except OSError:
+                self._close_osascript_session() # Broken pipe or unexpected output; spawn osascript instead
+        subprocess = _subprocess()
+        try:
+            osscript_output_bytes = subprocess.check_output([_OSASCRIPT, '-e', script], stderr=subprocess.PIPE,
+                                                            close_fds=False)
+            # Strip the trailing newline on the bytes so the text is decoded (and copied) once
+            return osscript_output_bytes.strip().decode('utf-8')
+        except FileNotFoundError:
+            raise VeertuAppNotFoundException('osascript is not available; Veertu can only be controlled on macOS.')
+        except subprocess.CalledProcessError as e:
+            # Capture stderr for better error reporting
+            error_message = e.stderr.decode('utf-8').strip() if e.stderr else str(e)
+            raise self._osa_error(error_message, script)
+
+    def _run_in_session(self, script: str) -> Optional[str]:
+        """Output of `script` run in the shared osascript session, or None if the script failed."""
+        if self._osascript_session is None:
+            self._osascript_session = _OsascriptSession()
+        output, error = self._osascript_session.run(script)
+        return output if error is None else None
+
+    def _close_osascript_session(self) -> None:
+        session, self._osascript_session = self._osascript_session, None
+        if session is not None:
+            try:
+                session.close()
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """Ends the long-lived osascript session, if one was started, and closes the property cache."""
+        self._close_osascript_session()
+        self._property_cache.close()
+
+    def __del__(self) -> None:
+        # getattr: __init__ may not have got as far as creating the attribute
+        if getattr(self, '_osascript_session', None) is not None:
+            self.close()
+
+    def _run_osakit(self, compiled: Any, script: str) -> str:
+        result, error = compiled.executeAndReturnError_(None)
+        if error is not None:
+            osakit = _osakit()
+            message = error.get(osakit.OSAScriptErrorMessageKey) or error.get('NSAppleScriptErrorMessage') or str(error)
+            number = error.get(osakit.OSAScriptErrorNumberKey)
+            if number in _APP_NOT_FOUND_ERRORS:
+                message = "Application can't be found ({}): {}".format(number, message)
+            raise self._osa_error(str(message), script, number)
+        return _descriptor_text(result).strip()
+
+    # The app's answer to a reference to a VM that does not exist: errAENoSuchObject for `vm id "..."`.
+    _VM_NOT_FOUND_ERROR = re.compile(r'Can.t get vm id\b')
+
+    def _osa_error(self, error_message: str, script: str, number: Optional[int] = None) -> VeertuManagerException:
+        # It's possible the app isn't found or another osascript error occurred
+        if "Application can't be found" in error_message or "Application not running" in error_message :
+            return VeertuAppNotFoundException('Application "{}" not found or not running. OSA Error: {}'.format(self.app, error_message))
+        # osascript only reports the number in the message, e.g. 'Can’t get vm id "x". (-1728)'
+        no_such_object = number == self._NO_SUCH_OBJECT_ERROR or '({})'.format(self._NO_SUCH_OBJECT_ERROR) in error_message
+        if no_such_object and self._VM_NOT_FOUND_ERROR.search(error_message):
+            return VMNotFoundException('VM not found in app "{}": {}'.format(self.app, error_message))
+        return VeertuManagerException('OSA Script execution failed for app "{}": {}. Command: {}'.format(self.app, error_message, script))
+
+    def _is_int_parsed(self, num_str): # Renamed num to num_str
+        # Digit check instead of int() in a try block: 'true'/'false' are the usual
+        # scalar answers and should not cost a raised ValueError.
+        digits = num_str[1:] if num_str[:1] in ('+', '-') else num_str
+        return digits.isascii() and digits.isdigit()
 
     def _call_veertu_with_name_fallback(self, command, *args, **kwargs):
+        """
+        Runs the `command` template with `args`; if the VM is not found, treats `id_value` as a
+        VM name and runs the template again with the matching id at position `id_index` of args
+        (by default the first argument equal to id_value).
+        """
         id_value = kwargs.pop('id_value', args[0] if args else None)
         if id_value is None:
             raise VeertuManagerException("No vm_id or id_value provided for fallback.")
 
         # Ensure all args are strings for command.format()
         str_args = [str(arg) for arg in args]
-        command_formatted = command.format(*str_args)
+        id_index = kwargs.pop('id_index', None)
+        if id_index is None:
+            if str(id_value) not in str_args:
+                raise VeertuManagerException("id_value {} is not one of the command arguments.".format(id_value))
+            id_index = str_args.index(str(id_value))
+
+        resolved = self._resolved_vm_ids.get(str(id_value))
+        if resolved is not None and resolved != str(id_value):
+            # A name resolved earlier; go straight to its id instead of failing by id first
+            try:
+                return self._call_veertu_app(command, *self._with_id(str_args, id_index, resolved), **kwargs)
+            except VMNotFoundException:
+                del self._resolved_vm_ids[str(id_value)] # Renamed or deleted elsewhere; resolve again
 
         try:
-            return self._call_veertu_app(command_formatted, format=False, **kwargs)
-        except subprocess.CalledProcessError as e: # This exception is now handled inside _call_veertu_app
-            # This block might be redundant if _call_veertu_app raises VeertuAppNotFoundException
-            # or VeertuManagerException for osascript errors.
-            # If it's specifically for VMNotFound, then it needs to be more specific.
-            # For now, let's assume VMNotFoundException might still be the goal here.
-            pass # Fall through to name lookup
+            result = self._call_veertu_app(command, *str_args, **kwargs)
+            self._resolved_vm_ids[str(id_value)] = str(id_value)
+            return result
         except VMNotFoundException: # Explicitly catch if _call_veertu_app determined it's VMNotFound
             pass # Fall through to name lookup
         except VeertuAppNotFoundException: # If app itself is not found, re-raise
@@ -280,44 +729,67 @@ class VeertuManager(object):
 
         # Fallback logic
         try:
-            vms_list = self.list()
-            for vm in vms_list:
-                name = vm.get('name')
-                if name == str(id_value): # Compare with string version of id_value
-                    vm_id_found = vm.get('id')
-                    # Replace only the first occurrence of id_value, assuming it's the VM identifier part
-                    new_command_formatted = command_formatted.replace(str(id_value), vm_id_found, 1)
-                    return self._call_veertu_app(new_command_formatted, format=False, **kwargs)
+            vm_id_found = self._name_to_id.get(str(id_value))
+            if not vm_id_found:
+                self.list() # Refreshes the name index when the cached list is stale
+                vm_id_found = self._name_to_id.get(str(id_value))
+            if vm_id_found:
+                # Rebuild the command from the template rather than searching the formatted
+                # text, which could also hit a name or path that contains the same string
+                result = self._call_veertu_app(command, *self._with_id(str_args, id_index, vm_id_found), **kwargs)
+                self._resolved_vm_ids[str(id_value)] = vm_id_found
+                return result
         except VeertuManagerException as e_fallback: # Catch errors during fallback list() or subsequent call
             raise VMNotFoundException("VM {} not found by ID, and fallback by name also failed: {}".format(id_value, e_fallback))
 
         raise VMNotFoundException("VM {} was not found by ID or name.".format(id_value))
 
+    @staticmethod
+    def _with_id(str_args, id_index, vm_id):
+        return str_args[:id_index] + [vm_id] + str_args[id_index + 1:]
+
 
     def list(self):
-        projection_args = OrderedDict([('id', True), ('name', True)])
-        return self._call_veertu_app('{{id, name}} of every vm', return_list_of_dicts=True, projection=projection_args)
+        if self._list_cache is not None:
+            cached_at, vms_list = self._list_cache
+            if time.monotonic() - cached_at < self._list_ttl:
+                return vms_list
+        vms_list = self._call_veertu_app('{id, name} of every vm', return_list_of_dicts=True,
+                                         projection=_projection(('id', 'name')), shared=True)
+        self._list_cache = (time.monotonic(), vms_list)
+        self._name_to_id.clear()
+        for vm in vms_list:
+            # setdefault keeps the first VM of a duplicated name, as the old linear scan did
+            self._name_to_id.setdefault(vm.get('name'), vm.get('id'))
+        return vms_list
+
+    def _invalidate_list_cache(self):
+        self._list_cache = None
+        self._name_to_id.clear()
+        self._resolved_vm_ids.clear()
+        self._forget_property_values() # Names may now refer to other VMs
 
     def show(self, vm_id, state=True, ip_address=True, port_forwarding=True):
-        projection_args = OrderedDict([('id', True), ('name', True), ('status', state), ('ip', ip_address)])
+        projection_args = _projection(('id', 'name', 'status', 'ip'), (True, True, bool(state), bool(ip_address)))
         command = 'get {{id, name, status, ip}} of vm id "{}"'
         vm_info = self._call_veertu_with_name_fallback(command, vm_id, id_value=vm_id, return_as_dict=True,
-                                                       projection=projection_args)
+                                                       projection=projection_args, shared=True)
         if port_forwarding and vm_info.get('id'): # Ensure vm_info is not empty and has id
             vm_info['port_forwarding'] = self.get_port_forwarding(vm_info.get('id'))
         return vm_info
 
     def get_port_forwarding(self, vm_id, protocol=True, description=True, host_ip=True,
                             host_port=True, guest_ip=True, guest_port=True):
-        projection_args = OrderedDict([('name', True), ('protocol', protocol),
-                                       ('host_ip', host_ip), ('host_port', host_port),
-                                       ('guest_ip', guest_ip), ('guest_port', guest_port)])
+        projection_args = _projection(('name', 'protocol', 'host_ip', 'host_port', 'guest_ip', 'guest_port'),
+                                      (True, bool(protocol), bool(host_ip), bool(host_port),
+                                       bool(guest_ip), bool(guest_port)))
         command = '{{name, protocol, host ip, host port, guest ip, guest port}}' \
                   ' of port forwarding of advanced settings of vm id "{}"'
         # Use try-except for cases where 'port forwarding' might not exist or be empty
         try:
             port_forwarding_info = self._call_veertu_app(command, vm_id, return_as_dict=False, # Expecting list of dicts
-                                                         projection=projection_args, return_list_of_dicts=True)
+                                                         projection=projection_args, return_list_of_dicts=True,
+                                                         shared=True)
         except WrongProjectionException as e: # If output is empty leading to this
              if "Output length 0" in str(e) or "Output length 1 not divisible" in str(e): # Check if it's due to empty list
                 return [] # No port forwarding rules
@@ -334,17 +806,57 @@ class VeertuManager(object):
                 valid_rules.append(rule)
         port_forwarding_info = valid_rules
 
-        if description:
-            for port_forwarding_dict in port_forwarding_info:
-                rule_description = self.get_port_forwarding_description(vm_id, port_forwarding_dict.get('name', ''))
+        if description and port_forwarding_info:
+            rule_names = [rule.get('name', '') for rule in port_forwarding_info]
+            for port_forwarding_dict, rule_description in zip(port_forwarding_info,
+                                                              self._get_port_forwarding_descriptions(vm_id, rule_names)):
                 port_forwarding_dict['description'] = rule_description
         return port_forwarding_info
 
+    _DESCRIPTION_COMMAND = 'virtualbox description of port forwarding "{}" of advanced settings of vm id "{}"'
+    # Joins the values of a batched read; unlike ', ' it cannot occur inside a value.
+    _VALUE_SEPARATOR = '--veertu-value--'
+
+    def _joined_values_lines(self, expressions, missing):
+        """
+        Script lines (for a tell block) that evaluate each AppleScript expression as text, with
+        missing values replaced by `missing`, and return them joined by _VALUE_SEPARATOR.
+        """
+        lines = ['set collected to {}']
+        for expression in expressions:
+            lines += ['set v to ' + expression,
+                      'if v is missing value then set v to "{}"'.format(missing),
+                      'set end of collected to v as text']
+        lines += ["set AppleScript's text item delimiters to \"{}\"".format(self._VALUE_SEPARATOR),
+                  'return collected as text']
+        return lines
+
+    def _split_joined_values(self, output, count):
+        values = output.split(self._VALUE_SEPARATOR)
+        if len(values) != count:
+            raise InternalAppError('Expected {} values, got: {}'.format(count, values))
+        return [value.strip() for value in values]
+
+    def _get_port_forwarding_descriptions(self, vm_id, rule_names):
+        """Reads the descriptions of several rules in one script, in rule_names order."""
+        memo = self._port_forwarding_descriptions
+        missing = [name for name in rule_names if (str(vm_id), name) not in memo]
+        if missing:
+            expressions = [self._DESCRIPTION_COMMAND.format(name.replace('"', '\\"'), vm_id) for name in missing]
+            lines = (['tell application "{}"'.format(self._quoted_app())] +
+                     self._joined_values_lines(expressions, missing='') + ['end tell'])
+            found = self._split_joined_values(self._run_osascript('\n'.join(lines)), len(missing))
+            for name, desc in zip(missing, found):
+                memo[(str(vm_id), name)] = desc
+        return [memo[(str(vm_id), name)] for name in rule_names]
+
     def get_port_forwarding_description(self, vm_id, rule_name):
-        command = 'virtualbox description of port forwarding "{}" of advanced settings of vm id "{}"'
-        # This might return "missing value" which becomes "-"
-        desc = self._call_veertu_app(command, rule_name, vm_id, return_formatted=False)
-        return desc if desc != '-' else ""
+        key = (str(vm_id), rule_name)
+        if key not in self._port_forwarding_descriptions:
+            # This might return "missing value" which becomes "-"
+            desc = self._call_veertu_app(self._DESCRIPTION_COMMAND, rule_name, vm_id, return_formatted=False)
+            self._port_forwarding_descriptions[key] = desc if desc not in ('-', 'missing value') else ""
+        return self._port_forwarding_descriptions[key]
 
 
     def start(self, vm_id, restart=False):
@@ -364,31 +876,43 @@ class VeertuManager(object):
             command = 'shutdown of vm id "{}"'
         return self._call_veertu_with_name_fallback(command, vm_id, id_value=vm_id, scalar=True)
 
+    # Forced reboot in one script: power off, wait (up to a minute) until the VM no longer
+    # reports "running" (the one status value the CLI relies on), then start it. {0} is the vm id.
+    _FORCE_REBOOT_COMMAND = '\n'.join([
+        'force shutdown of vm id "{0}"',
+        'repeat 240 times',
+        'if status of vm id "{0}" is not "running" then exit repeat',
+        'delay 0.25',
+        'end repeat',
+        'return start of vm id "{0}"',
+    ])
+
     def reboot(self, vm_id, force=False):
         if force:
-            # Ensure shutdown completes before starting. This might need a loop or check.
-            # For simplicity, just calling them sequentially.
-            self.shutdown(vm_id, force=True)
-            # Add a small delay to allow shutdown to process if needed
-            # time.sleep(1) # Consider if this is necessary
-            return self.start(vm_id)
+            return self._call_veertu_with_name_fallback(self._FORCE_REBOOT_COMMAND, vm_id, id_value=vm_id, scalar=True)
         command = 'restart of vm id "{}"' # Original had 'restart   of ...'
         return self._call_veertu_with_name_fallback(command, vm_id, id_value=vm_id, scalar=True)
 
     def delete(self, vm_id):
         command = 'delete vm id "{}"'
-        return self._call_veertu_with_name_fallback(command, vm_id, id_value=vm_id, scalar=True)
+        try:
+            return self._call_veertu_with_name_fallback(command, vm_id, id_value=vm_id, scalar=True)
+        finally:
+            # Only once the app has answered: a list() during the call would cache the VM again
+            self._invalidate_list_cache()
 
-    def export_vm(self, vm_id, output_file, fmt='box', silent=False, do_progress_loop=True):
+    def export_vm(self, vm_id, output_file, fmt='box', silent=False, do_progress_loop=True, overwrite=False):
         if not output_file:
             raise NoOutputFileSpecified('no output file specified')
         d, f = os.path.split(output_file)
-        if '.' not in f: # Ensure filename has an extension
+        if not os.path.splitext(f)[1]: # Ensure filename has an extension
             f += "." + fmt
         # Ensure directory exists
         if d:
             os.makedirs(d, exist_ok=True)
         output_file = os.path.join(d, f)
+        if not overwrite and os.path.exists(output_file):
+            raise FileExistsError(errno.EEXIST, 'Export target already exists', output_file)
 
 
         # Centralize invalid handle values
@@ -406,16 +930,16 @@ class VeertuManager(object):
     def create_vm(self, file_path, name, os_family, os_type):
         command = 'create vm POSIX file "{}" with name "{}" os "{}" os family "{}"'
         if not name:
-            d, f = os.path.split(file_path)
-            name = f
-            if '.' in name:
-                name = name.split('.').pop(0)
+            name = name_from_file_path(file_path)
 
         # Make sure all args to format are strings
         args_for_command = [str(file_path), str(name), str(os_type), str(os_family)]
         # Use _call_veertu_app directly if no name fallback is needed for create
         # Assuming create always needs explicit parameters and doesn't use a vm_id for fallback
-        result_list = self._call_veertu_app(command, *args_for_command, return_formatted=True) # Expects list
+        try:
+            result_list = self._call_veertu_app(command, *args_for_command, return_formatted=True) # Expects list
+        finally:
+            self._invalidate_list_cache()
         result = result_list[0] if result_list else None
 
         return None if result == 'false' or result is None or result == '-' else result
@@ -424,10 +948,7 @@ class VeertuManager(object):
     def import_vm(self, file_path, name, os_family, os_type, fmt, silent=False, do_progress_loop=True):
         command_parts = ['import vm POSIX file "{}" with name "{}"']
         if not name:
-            d, f = os.path.split(file_path)
-            name = f
-            if '.' in name:
-                name = name.split('.').pop(0)
+            name = name_from_file_path(file_path)
         args = [str(file_path), str(name)]
 
         if os_type:
@@ -440,51 +961,100 @@ class VeertuManager(object):
         # If fmt is important, it needs to be added to command_parts and args
 
         final_command = " ".join(command_parts)
-        handle = self._call_veertu_app(final_command, *args, return_formatted=False)
+        try:
+            handle = self._call_veertu_app(final_command, *args, return_formatted=False)
 
-        if not handle or handle == "0" or handle == "-": # Check for invalid handle
-             raise ImportExportFailedException("Failed to get a valid handle for import operation.")
+            if not handle or handle == "0" or handle == "-": # Check for invalid handle
+                 raise ImportExportFailedException("Failed to get a valid handle for import operation.")
 
-        if do_progress_loop:
-            self.progress_loop(handle, silent=silent)
-            return True
-        return handle
+            if do_progress_loop:
+                self.progress_loop(handle, silent=silent)
+                return True
+            return handle
+        finally:
+            self._invalidate_list_cache() # The imported VM is listed from now on
+
+    # Bounds (seconds) of the delay between progress polls; within them the delay
+    # follows a quarter of the estimated time left.
+    _PROGRESS_MIN_DELAY = 0.05
+    _PROGRESS_MAX_DELAY = 1.0
+
+    def _progress_delay(self, previous, current):
+        """Next poll delay from two (timestamp, progress) samples."""
+        if previous is None:
+            return self._PROGRESS_MIN_DELAY
+        elapsed = current[0] - previous[0]
+        advanced = current[1] - previous[1]
+        if elapsed <= 0 or advanced <= 0: # Stalled, nothing to extrapolate from
+            return self._PROGRESS_MAX_DELAY
+        eta = (1.0 - current[1]) * elapsed / advanced
+        return min(self._PROGRESS_MAX_DELAY, max(self._PROGRESS_MIN_DELAY, eta / 4))
+
+    # Waits inside one script for a progress handle to finish instead of polling from Python.
+    _WAIT_FOR_HANDLE_SCRIPT = '\n'.join([
+        'tell application "{app}"',
+        'repeat',
+        'set p to (get progress of "{handle}") as real',
+        'if p >= 1.0 then return "done"',
+        'if p < 0 then return "error:" & p',
+        'delay 0.25',
+        'end repeat',
+        'end tell',
+    ])
+
+    def _wait_for_handle(self, handle):
+        script = self._WAIT_FOR_HANDLE_SCRIPT.format(app=self._quoted_app(), handle=str(handle).replace('"', '\\"'))
+        try:
+            result = self._run_osascript(script)
+        except VeertuAppNotFoundException:
+            raise
+        except VeertuManagerException as e: # e.g. the handle's progress is missing and cannot be read as a number
+            raise ImportExportFailedException("Process failed to complete or invalid progress handle: {}".format(e))
+        if result.startswith('error:'):
+            raise ImportExportFailedException("Import/Export operation reported an error state: progress {}".format(result[len('error:'):]))
+        if result != 'done':
+            raise ImportExportFailedException("Unexpected result while waiting for progress: {}".format(result))
 
     def progress_loop(self, handle, silent=False):
         # progress value from app is float like "0.00" to "1.00", or "2.00" for error/unknown state
+        if silent:
+            # Nothing to print, so the whole wait is a single osascript run.
+            self._wait_for_handle(handle)
+            return
+        previous_sample = None
+        last_shown = None
         while True:
-            progress_str = self._call_veertu_app('get progress of "{}"', handle, return_formatted=False)
-            if not progress_str or progress_str == '(null)' or progress_str == "-":
-                raise ImportExportFailedException("Process failed to complete or invalid progress handle.")
-
-            try:
-                progress_float = float(progress_str)
-            except ValueError:
-                raise ImportExportFailedException("Invalid progress value received: {}".format(progress_str))
+            progress_float = self._read_progress(handle)
 
-            if not silent:
-                # Python 2 print was: print(progress_str)
-                # For Python 3, if you want it on the same line, use end='\r'
-                print("Progress: {:.0f}%".format(progress_float * 100), end='\r')
+            # Only redraw the line when the shown percentage changes
+            shown = "Progress: {:.0f}%".format(progress_float * 100)
+            if shown != last_shown:
+                print(shown, end='\r')
+                last_shown = shown
 
             if progress_float >= 1.0: # Completion (1.00 or more)
                 break
             if progress_float < 0.0: # Typically error codes like -1.0, or the 2.00 mentioned in original comments
                  raise ImportExportFailedException("Import/Export operation reported an error state: progress {}".format(progress_float))
 
-            time.sleep(1)
-        if not silent:
-            print() # Newline after loop finishes
+            sample = (time.monotonic(), progress_float)
+            time.sleep(self._progress_delay(previous_sample, sample))
+            previous_sample = sample
+        print() # Newline after loop finishes
 
-    def progress(self, handle):
+    # A plain decimal as printed by AppleScript; anything else is reported without trying float().
+    _PROGRESS_VALUE = re.compile(r'[-+]?(?:\d+(?:\.\d*)?|\.\d+)')
+
+    def _read_progress(self, handle):
         progress_string = self._call_veertu_app('get progress of "{}"', handle, return_formatted=False)
         if not progress_string or progress_string == '(null)' or progress_string == "-":
             raise ImportExportFailedException("Process failed to complete or invalid progress handle.")
-
-        try:
-            progress_num_float = float(progress_string.strip())
-        except ValueError:
+        if not self._PROGRESS_VALUE.fullmatch(progress_string):
             raise ImportExportFailedException("Invalid progress value received: {}".format(progress_string))
+        return float(progress_string)
+
+    def progress(self, handle):
+        progress_num_float = self._read_progress(handle)
 
         if progress_num_float < 0: # Error
             raise ImportExportFailedException("Operation reported error state: progress {}".format(progress_num_float))
@@ -497,49 +1067,110 @@ class VeertuManager(object):
 
     def describe(self, vm_id, advanced_settings=True, general_settings=True, hardware=True):
         # Basic VM info
-        keys = ['id', 'name', 'status', 'ip', 'version'] # 'version' was in original keys, assuming it's vm config version or similar
-        vm_info = self._get_section(vm_id, keys) # No specific section for these top-level items
+        vm_info = self._get_section(vm_id, *self._VM_INFO) # No specific section for these top-level items
 
         if not vm_info.get('id'): # If basic info failed or vm_id is invalid
             raise VMNotFoundException(f"Could not retrieve basic info for VM ID: {vm_id}")
 
+        # The id is resolved now, so every remaining section is read in one script.
+        resolved_id = vm_info['id']
+        requested = []
         if advanced_settings:
-            vm_info['advanced_settings'] = self.get_advanced_settings(vm_info.get('id'))
+            requested += [self._ADVANCED_SETTINGS, self._GUEST_TOOLS]
         if general_settings:
-            vm_info['general_settings'] = self.get_general_settings(vm_info.get('id'))
+            requested.append(self._GENERAL_SETTINGS)
         if hardware:
-            vm_info['hardware'] = self.get_hardware(vm_info.get('id'))
+            requested.append(self._HARDWARE)
+            requested += [part for _, part in self._HARDWARE_PARTS]
+        groups = iter(self._get_sections(resolved_id, requested))
+
+        if advanced_settings:
+            advanced = self._project_section(self._ADVANCED_SETTINGS, next(groups))
+            advanced['port_forwarding'] = self.get_port_forwarding(resolved_id, protocol=True, description=True,
+                                                                   host_ip=True, host_port=True, guest_ip=True,
+                                                                   guest_port=True)
+            advanced.update(self._project_section(self._GUEST_TOOLS, next(groups)))
+            vm_info['advanced_settings'] = advanced
+        if general_settings:
+            vm_info['general_settings'] = self._project_section(self._GENERAL_SETTINGS, next(groups))
+        if hardware:
+            hardware_info = self._project_section(self._HARDWARE, next(groups))
+            for name, part in self._HARDWARE_PARTS:
+                try:
+                    hardware_info[name] = self._project_section(part, next(groups))
+                except WrongProjectionException:
+                    hardware_info[name] = []
+            vm_info['hardware'] = hardware_info
         return vm_info
 
-    def _get_section(self, vm_id, keys, section=None): # section can be str or list/tuple
-        projection_args = OrderedDict([(k, True) for k in keys])
-        section_string_parts = []
-        if section:
-            # basestring is not in Python 3, use isinstance(section, str)
-            if isinstance(section, str):
-                section_string_parts.append("of " + section)
-            elif isinstance(section, (list, tuple)):
-                section_string_parts.extend(["of " + s for s in section])
-
-        # Construct the command: 'get {key1, key2} of section1 of section2 of vm id "..."'
-        # The order of "of section" parts matters and should be from most specific to least, or as AppleScript expects.
-        # Original was ` ' '.join(["of " + exp for exp in section]) ` which implies sections are nested in order.
-        # Example: `get {file sharing} of guest tools of advanced settings of vm id "..."`
-        command_core = 'get {{' + ', '.join(keys) + '}} '
-        command = command_core + ' '.join(section_string_parts) + (' of vm id "{}"' if vm_id else "")
+    # Sentinel list item separating the sections of a batched read.
+    _SECTION_SEPARATOR = '--veertu-section--'
 
+    def _get_sections(self, vm_id, sections):
+        """
+        Reads several (keys, section) groups of one VM in a single osascript round trip.
+        vm_id must be a VM id (names are not resolved). Returns the raw items of each group;
+        pass them to _project_section.
+        """
+        if not sections:
+            return []
+        parts = ['({})'.format(self._section_command(keys, section).format(vm_id)) for keys, section in sections]
+        separator = ', "{}", '.format(self._SECTION_SEPARATOR)
+        script = 'tell application "{}" to return {{{}}}'.format(self._quoted_app(), separator.join(parts))
+        groups = [[]]
+        for item in self._split_and_strip(self._run_shared_osascript(script)):
+            if item == self._SECTION_SEPARATOR:
+                groups.append([])
+            else:
+                groups[-1].append(item)
+        if len(groups) != len(sections):
+            raise InternalAppError('Expected {} sections, got {}'.format(len(sections), len(groups)))
+        return groups
+
+    def _project_section(self, section_spec, items):
+        keys, _ = section_spec
+        return self._project(items, _projection(tuple(keys)))
+
+    def _get_section(self, vm_id, keys, section=None): # section can be str or list/tuple
+        projection_args = _projection(tuple(keys))
         # If vm_id is part of the command (usually is), use fallback mechanism
         if vm_id:
-            return self._call_veertu_with_name_fallback(command.strip(), vm_id, id_value=vm_id,
-                                                        return_as_dict=True, projection=projection_args)
+            return self._call_veertu_with_name_fallback(self._section_command(keys, section), vm_id, id_value=vm_id,
+                                                        return_as_dict=True, projection=projection_args,
+                                                        shared=True)
         else: # Should not happen if vm_id is always expected for _get_section
              raise VeertuManagerException("_get_section called without vm_id when it's required by the command structure")
 
+    @staticmethod
+    def _section_command(keys, section=None):
+        """Returns 'get {key1, key2} of section1 of section2 of vm id "{}"' with the vm id left to format."""
+        # Sections are nested in order, most specific first, e.g.
+        # `get {file sharing} of guest tools of advanced settings of vm id "..."`
+        section_path = ''.join([' of ' + s for s in _as_section(section)])
+        return 'get {{' + ', '.join(keys) + '}}' + section_path + ' of vm id "{}"'
+
+    # (keys, section path) of each part of `describe`, shared with the individual getters.
+    # 'version' was in original keys, assuming it's vm config version or similar
+    _VM_INFO = (('id', 'name', 'status', 'ip', 'version'), None)
+    _ADVANCED_SETTINGS = (('snapshot', 'headless', 'hdpi', 'remap cmd'), 'advanced settings')
+    _GUEST_TOOLS = (('file sharing', 'copy paste', 'shared folder'), ('guest tools', 'advanced settings'))
+    _GENERAL_SETTINGS = (('os', 'os family', 'boot device'), 'general settings')
+    _HARDWARE = (('chipset', 'ram', 'acpi', 'hpet', 'hyperv', 'vga'), 'hardware')
+    _HARDDISKS = (('drive index', 'boot', 'controller', 'bus', 'file', 'size'), ('harddisks', 'hardware'))
+    _AUDIO = (('audio index', 'type'), ('audio', 'hardware'))
+    _CD_ROM = (('cd index', 'cd controller', 'cd file', 'cd bus', 'cd type', 'media in'), ('cd rom', 'hardware'))
+    _DISK_CONTROLLER = (('controller index', 'controller type', 'controller model', 'controller mode'),
+                        ('disk controller', 'hardware'))
+    _NETWORK_CARD = (('card index', 'connection', 'pci bus', 'mac address', 'card model', 'card family'),
+                     ('network card', 'hardware'))
+    # Hardware sub-sections, in the order get_hardware adds them.
+    _HARDWARE_PARTS = (('harddisks', _HARDDISKS), ('audio', _AUDIO), ('cd_roms', _CD_ROM),
+                       ('disk_controllers', _DISK_CONTROLLER), ('network_cards', _NETWORK_CARD))
+
 
     def get_advanced_settings(self, vm_id):
         # Corrected section path: 'advanced settings' is the direct section for these keys.
-        adv_keys = ['snapshot', 'headless', 'hdpi', 'remap cmd']
-        advanced_settings = self._get_section(vm_id, adv_keys, 'advanced settings')
+        advanced_settings = self._get_section(vm_id, *self._ADVANCED_SETTINGS)
 
         advanced_settings['port_forwarding'] = self.get_port_forwarding(vm_id, protocol=True, description=True,
                                                                         host_ip=True, host_port=True, guest_ip=True,
@@ -549,103 +1180,131 @@ class VeertuManager(object):
         return advanced_settings
 
     def get_guest_tools(self, vm_id):
-        keys = ['file sharing', 'copy paste', 'shared folder']
         # Section path: 'guest tools' is part of 'advanced settings'
-        return self._get_section(vm_id, keys, ['guest tools', 'advanced settings'])
+        return self._get_section(vm_id, *self._GUEST_TOOLS)
 
     def get_hardware(self, vm_id):
-        keys = ['chipset', 'ram', 'acpi', 'hpet', 'hyperv', 'vga'] # Basic hardware props
-        hardware_info = self._get_section(vm_id, keys, 'hardware')
-
-        # Sub-sections of hardware
-        # Ensure these calls handle potential empty results gracefully (e.g., return [] or {} )
-        try: hardware_info['harddisks'] = self.get_harddisks(vm_id)
-        except WrongProjectionException: hardware_info['harddisks'] = []
-
-        try: hardware_info['audio'] = self.get_audio(vm_id)
-        except WrongProjectionException: hardware_info['audio'] = [] # Or {} if it's a single item
-
-        try: hardware_info['cd_roms'] = self.get_cd_rom(vm_id) # 'cd roms' in original, snake_case for consistency
-        except WrongProjectionException: hardware_info['cd_roms'] = []
-
-        try: hardware_info['disk_controllers'] = self.get_disk_controller(vm_id)
-        except WrongProjectionException: hardware_info['disk_controllers'] = []
-
-        try: hardware_info['network_cards'] = self.get_network_cards(vm_id)
-        except WrongProjectionException: hardware_info['network_cards'] = []
+        hardware_info = self._get_section(vm_id, *self._HARDWARE) # Basic hardware props
+
+        # Sub-sections of hardware; a missing sub-section (WrongProjectionException) becomes []
+        parts = (('harddisks', self.get_harddisks), ('audio', self.get_audio), ('cd_roms', self.get_cd_rom),
+                 ('disk_controllers', self.get_disk_controller), ('network_cards', self.get_network_cards))
+        if _osakit() is None and not _OSASCRIPT_SESSION:
+            # Each query is its own osascript process, so they can run side by side.
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=len(parts)) as pool:
+                futures = [(name, pool.submit(self._get_hardware_part, getter, vm_id)) for name, getter in parts]
+                for name, future in futures:
+                    hardware_info[name] = future.result()
+        else:
+            # OSAKit and the shared osascript session are not safe to drive from several threads.
+            for name, getter in parts:
+                hardware_info[name] = self._get_hardware_part(getter, vm_id)
 
         return hardware_info
 
+    @staticmethod
+    def _get_hardware_part(getter, vm_id):
+        try:
+            return getter(vm_id)
+        except WrongProjectionException:
+            return []
+
     def get_harddisks(self, vm_id): # Plural, returns list of dicts
-        keys = ['drive index', 'boot', 'controller', 'bus', 'file', 'size']
-        return self._get_section(vm_id, keys, ['harddisks', 'hardware']) # Plural form in AppleScript? Check this. Assuming 'harddisk' for items of 'harddisks'
+        return self._get_section(vm_id, *self._HARDDISKS) # Plural form in AppleScript? Check this. Assuming 'harddisk' for items of 'harddisks'
 
     def get_audio(self, vm_id): # Potentially list if multiple audio devices supported
-        keys = ['audio index', 'type']
-        return self._get_section(vm_id, keys, ['audio', 'hardware'])
+        return self._get_section(vm_id, *self._AUDIO)
 
     def get_cd_rom(self, vm_id): # Potentially list
-        keys = ['cd index', 'cd controller', 'cd file', 'cd bus', 'cd type', 'media in']
-        return self._get_section(vm_id, keys, ['cd rom', 'hardware']) # Singular 'cd rom' for items of 'cd roms'
+        return self._get_section(vm_id, *self._CD_ROM) # Singular 'cd rom' for items of 'cd roms'
 
     def get_disk_controller(self, vm_id): # Potentially list
-        keys = ['controller index', 'controller type', 'controller model', 'controller mode']
-        return self._get_section(vm_id, keys, ['disk controller', 'hardware'])
+        return self._get_section(vm_id, *self._DISK_CONTROLLER)
 
     def get_network_cards(self, vm_id): # Potentially list
-        keys = ['card index', 'connection', 'pci bus', 'mac address', 'card model', 'card family']
-        return self._get_section(vm_id, keys, ['network card', 'hardware'])
+        return self._get_section(vm_id, *self._NETWORK_CARD)
 
 
     def get_general_settings(self, vm_id):
-        keys = ['os', 'os family', 'boot device']
-        # No _call_veertu_app directly, use _get_section for consistency and fallback
-        return self._get_section(vm_id, keys, 'general settings')
+        return self._get_section(vm_id, *self._GENERAL_SETTINGS)
 
 
+    _SET_HEADLESS_COMMAND = 'set headless of advanced settings of vm id "{}" to {}'
+    _RENAME_COMMAND = 'rename vm id "{}" to name "{}"' # This might be `set name of vm id "{}" to "{}"`
+    _SET_NETWORK_TYPE_COMMAND = 'set network card connection type of vm id "{}" with index {} to "{}"'
+
+    @staticmethod
+    def _headless_literal(value):
+        """AppleScript 'true'/'false' for a headless value: '0'/'1' from click.Choice, or a bool."""
+        bool_value = value if isinstance(value, bool) else str(value) == '1'
+        return 'true' if bool_value else 'false'
+
     def set_headless(self, vm_id, value):
-        # Value is '0' or '1' from click.Choice. Convert to boolean for AppleScript.
-        bool_value = True if str(value) == '1' else False
-        # AppleScript expects 'true' or 'false' literals
-        as_value = 'true' if bool_value else 'false'
-        command = 'set headless of advanced settings of vm id "{}" to {}' # Corrected path
+        as_value = self._headless_literal(value)
+        reference = _property_reference('headless', ('advanced settings',))
+        if self._has_property_value(vm_id, reference, as_value):
+            return True
+        command = self._SET_HEADLESS_COMMAND
         # Using format with *args, ensure vm_id is first, then as_value.
-        return self._call_veertu_with_name_fallback(command, vm_id, as_value, id_value=vm_id, scalar=True)
+        return self._write_property(reference, command, vm_id, as_value, id_value=vm_id, scalar=True)
 
 
-    def unset_headless(self, vm_id): # This seems redundant if set_headless(vm_id, '0') works
-        command = 'set headless of advanced settings of vm id "{}" to false' # Corrected path
-        return self._call_veertu_with_name_fallback(command, vm_id, id_value=vm_id, scalar=True)
+    def unset_headless(self, vm_id):
+        return self.set_headless(vm_id, False)
 
     def add_port_forwarding(self, vm_id, name, host_ip, host_port, guest_ip, guest_port, protocol='tcp'):
-        # Ensure all params are properly quoted or formatted if they contain spaces or special chars.
-        # AppleScript command for adding port forwarding might be different.
-        # Original command: 'listen on "{}" {} port {} forward to vm id "{}" port {} with name "{}"'
+        # Rejected here rather than by Veertu, which would cost an osascript round trip
+        host_ip = str(host_ip if host_ip is not None else "127.0.0.1") # Default host_ip
+        protocol = str(protocol).lower()
+        if protocol not in ('tcp', 'udp'):
+            raise VeertuManagerException('Protocol must be tcp or udp, not {}'.format(protocol))
+        for port in (host_port, guest_port):
+            if not self._is_port(port):
+                raise VeertuManagerException('Invalid port: {}'.format(port))
+        import ipaddress
+        try:
+            ipaddress.ip_address(host_ip)
+        except ValueError:
+            raise VeertuManagerException('Invalid host IP address: {}'.format(host_ip))
+        self._port_forwarding_descriptions.clear()
+        self._forget_property_values(vm_id)
         # This looks like a custom syntax not standard AppleScript for object properties.
         # Assuming it's a custom command handler in the Veertu app.
-        # Need to ensure all args are strings.
-        args = [
-            str(host_ip if host_ip is not None else "127.0.0.1"), # Default host_ip
-            str(protocol).lower(),
-            str(host_port),
-            str(vm_id),
-            str(guest_port),
-            str(name)
-        ]
+        args = [host_ip, protocol, str(host_port), str(vm_id), str(guest_port),
+                str(name).replace('"', '\\"')] # Escape quotes in the rule name
         command = 'listen on "{}" {} port {} forward to vm id "{}" port {} with name "{}"'
-        return self._call_veertu_with_name_fallback(command, *args, id_value=vm_id, number=True)
+        return self._call_veertu_with_name_fallback(command, *args, id_value=vm_id, id_index=3, number=True)
+
+    @staticmethod
+    def _is_port(port):
+        port = str(port)
+        return port.isdigit() and 0 < int(port) < 65536
 
 
     def remove_port_forwarding(self, vm_id, rule_name):
+        self._port_forwarding_descriptions.clear()
+        self._forget_property_values(vm_id)
         command = 'remove port forwarding "{}" from vm id "{}"' # Path might need 'of advanced settings'
-        return self._call_veertu_with_name_fallback(command, rule_name, vm_id, id_value=vm_id, number=True)
+        return self._call_veertu_with_name_fallback(command, str(rule_name).replace('"', '\\"'), vm_id,
+                                                    id_value=vm_id, id_index=1, number=True)
 
     def rename(self, vm_id, new_name):
-        command = 'rename vm id "{}" to name "{}"' # This might be `set name of vm id "{}" to "{}"`
+        command = self._RENAME_COMMAND
         # return_formatted=False returns raw string. If it's a success/fail message, it's fine.
         # If it's expected to be a boolean or specific status, adjust parsing.
         # For now, assume raw string output is OK.
-        return self._call_veertu_with_name_fallback(command, vm_id, new_name, id_value=vm_id, return_formatted=False)
+        try:
+            result = self._call_veertu_with_name_fallback(command, vm_id, str(new_name).replace('"', '\\"'),
+                                                          id_value=vm_id, return_formatted=False)
+        finally:
+            resolved = self._resolved_vm_ids.get(str(vm_id))
+            self._invalidate_list_cache()
+        if resolved is not None:
+            if resolved == str(vm_id): # Referred to by id, which the rename does not change
+                self._resolved_vm_ids[resolved] = resolved
+            self._resolved_vm_ids[str(new_name)] = resolved
+        return result
 
 
     def set_cpu(self, vm_id, cpu_count):
@@ -658,38 +1317,157 @@ class VeertuManager(object):
         return self.set_property(vm_id, 'ram', str(ram), section=['hardware'], string_type=True) # string_type=True if value needs quotes
 
     def set_network_type(self, vm_id, card_index, net_type): # Renamed 'type' to 'net_type'
+        self._forget_property_values(vm_id)
         # Command: 'set network card connection type of vm id "{}" with index {} to "{}"'
         # This seems like a custom command rather than direct property set.
         # Or it could be: `set connection of network card index {} of hardware of vm id "{}" to "{}"`
         # For now, stick to the provided custom command structure.
-        command = 'set network card connection type of vm id "{}" with index {} to "{}"'
+        command = self._SET_NETWORK_TYPE_COMMAND
         args_for_cmd = [str(vm_id), str(card_index), str(net_type)]
         return self._call_veertu_with_name_fallback(command, *args_for_cmd, id_value=vm_id, scalar=True)
 
 
     def add_network_card(self, vm_id, connection_type, model):
+        self._forget_property_values(vm_id)
         command = 'add network card vm id "{}" connection type "{}" model "{}"'
         args_for_cmd = [str(vm_id), str(connection_type), str(model)]
         return self._call_veertu_with_name_fallback(command, *args_for_cmd, id_value=vm_id, scalar=True)
 
 
     def delete_network_card(self, vm_id, card_index):
+        self._forget_property_values(vm_id)
         command = 'remove network card vm id "{}" index {}'
         args_for_cmd = [str(vm_id), str(card_index)]
         return self._call_veertu_with_name_fallback(command, *args_for_cmd, id_value=vm_id, scalar=True)
 
 
+    def set_properties(self, vm_id, props):
+        """
+        Applies several VM settings in a single osascript round trip.
+        `props` maps 'headless', 'name', 'cpu', 'ram' or 'network_type' (a (card_index, type) pair)
+        to the new value. Returns a dict with the same keys telling whether each setting was applied.
+        vm_id must be a VM id; names are not resolved here (use show() first).
+        """
+        keys = list(props)
+        if not keys:
+            return {}
+        self._forget_property_values(vm_id)
+        lines = ['tell application "{}"'.format(self._quoted_app()), 'set results to {}']
+        for key in keys:
+            # Each setting runs in its own try block so one rejected value does not abort the rest.
+            lines += ['try', self._setting_command(vm_id, key, props[key]),
+                      'set end of results to true', 'on error', 'set end of results to false', 'end try']
+        lines += ['return results', 'end tell']
+        try:
+            applied = self._split_and_strip(self._run_osascript('\n'.join(lines)))
+        finally:
+            if 'name' in props:
+                self._invalidate_list_cache()
+        if len(applied) != len(keys):
+            raise InternalAppError('Expected {} results from set_properties, got: {}'.format(len(keys), applied))
+        return dict(zip(keys, (item == 'true' for item in applied)))
+
+    def apply_bulk(self, func_name, args_per_vm, max_workers=8):
+        """
+        Calls the manager method `func_name` once per entry of `args_per_vm`, each entry being the
+        positional arguments for one call with the vm id first, e.g.
+        apply_bulk('set_cpu', [(vm_a, 2), (vm_b, 4)]).
+        Returns the results in the order of `args_per_vm`; a call that failed gives its
+        VeertuManagerException or OSError (e.g. export_vm's FileExistsError) instead.
+        Calls for the same vm id run one after another, in order.
+        """
+        method = getattr(self, func_name)
+        calls = [tuple(args) for args in args_per_vm]
+        results = [None] * len(calls)
+
+        def run(indexes):
+            for index in indexes:
+                try:
+                    results[index] = method(*calls[index])
+                except (VeertuManagerException, OSError) as e:
+                    results[index] = e
+
+        calls_per_vm = {}
+        for index, args in enumerate(calls):
+            calls_per_vm.setdefault(str(args[0]), []).append(index)
+        if _osakit() is None and not _OSASCRIPT_SESSION and len(calls_per_vm) > 1:
+            # Each call is its own osascript process, so the VMs are handled side by side.
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(calls_per_vm))) as pool:
+                for future in [pool.submit(run, indexes) for indexes in calls_per_vm.values()]:
+                    future.result()
+        else:
+            # OSAKit and the shared osascript session are not safe to drive from several threads.
+            run(range(len(calls)))
+        return results
+
+    def _setting_command(self, vm_id, key, value):
+        if key == 'headless':
+            return self._SET_HEADLESS_COMMAND.format(vm_id, self._headless_literal(value))
+        if key == 'name':
+            # An unescaped quote would break the whole batch, not just the rename
+            return self._RENAME_COMMAND.format(vm_id, str(value).replace('"', '\\"'))
+        if key == 'cpu':
+            return self._set_property_command(vm_id, 'cpu count', value, section=['hardware'])
+        if key == 'ram':
+            return self._set_property_command(vm_id, 'ram', str(value), section=['hardware'], string_type=True)
+        if key == 'network_type':
+            card_index, net_type = value
+            return self._SET_NETWORK_TYPE_COMMAND.format(vm_id, card_index, net_type)
+        raise VeertuManagerException('Unknown VM setting: {}'.format(key))
+
     def set_property(self, vm_id, property_name, value, section=None, string_type=False, **kwargs):
+        command = self._set_property_template(property_name, section)
+        # The template is 'set <reference>of vm id ...'
+        reference = command[len('set '):command.index('of vm id "{}"')]
+        value_str = self._property_value(value, string_type)
+        if self._has_property_value(vm_id, reference, value_str, string_type):
+            return True
+        oargs = {'scalar': True} # Default expectation for set operations
+        oargs.update(kwargs)
+        return self._write_property(reference, command, vm_id, value_str, id_value=vm_id, id_index=0, **oargs)
+
+    # How long a value read from Veertu is trusted to skip a write; the VM may be changed
+    # in the Veertu GUI or by another process at any time.
+    _PROPERTY_VALUE_TTL = 2.0
+
+    def _has_property_value(self, vm_id, reference, value_str, string_type=False):
+        """True if get_properties read `reference` of the VM as the literal `value_str` just now."""
+        known = self._property_values.get((str(vm_id), reference))
+        if known is None or time.monotonic() - known[1] >= self._PROPERTY_VALUE_TTL:
+            return False
+        return self._property_value(known[0], string_type) == value_str
+
+    def _write_property(self, reference, command, vm_id, *args, **kwargs):
+        """Runs a property-setting command, forgetting the value read for it (all of the VM's on failure)."""
+        self._property_values.pop((str(vm_id), reference), None)
+        self._property_cache.clear()
+        try:
+            return self._call_veertu_with_name_fallback(command, vm_id, *args, **kwargs)
+        except VeertuManagerException:
+            self._forget_property_values(vm_id)
+            raise
+
+    def _forget_property_values(self, vm_id=None):
+        self._property_cache.clear() # Other invocations may have cached the VM under another id or name
+        if vm_id is None:
+            self._property_values.clear()
+        else:
+            for key in [key for key in self._property_values if key[0] == str(vm_id)]:
+                del self._property_values[key]
+
+    def _set_property_command(self, vm_id, property_name, value, section=None, string_type=False):
+        return self._set_property_template(property_name, section).format(vm_id, self._property_value(value, string_type))
+
+    @staticmethod
+    def _set_property_template(property_name, section=None):
+        """Returns 'set <property> of <section path> of vm id "{}" to {}' with the vm id and value left to format."""
         # section should be a list of path elements, e.g., ['guest tools', 'advanced settings']
         # property_name is the final property in that path.
+        return _set_property_template(property_name, _as_section(section))
 
-        section_path_str = ""
-        if section:
-            if isinstance(section, str): # Single section string
-                section_path_str = "of {} ".format(section)
-            elif isinstance(section, list): # List of section path elements
-                section_path_str = " ".join(["of {}".format(s) for s in reversed(section)]) + " " # Reversed for AppleScript path
-
+    @staticmethod
+    def _property_value(value, string_type=False):
         # Value formatting: if string_type, enclose in quotes. Numbers/booleans usually don't need quotes.
         # AppleScript booleans are 'true'/'false' literals.
         if isinstance(value, bool):
@@ -698,58 +1476,82 @@ class VeertuManager(object):
             value_str = '"{}"'.format(value.replace('"', '\\"')) # Escape quotes in string value
         else:
             value_str = str(value)
-
-        command = 'set {} {}of vm id "{}" to {}'.format(property_name, section_path_str, vm_id, value_str)
-
-        oargs = {'scalar': True} # Default expectation for set operations
-        oargs.update(kwargs)
-        return self._call_veertu_with_name_fallback(command, vm_id, value_str, # vm_id, value_str are for fallback if prop name is part of id_value
-                                                    id_value=vm_id, **oargs)
+        return value_str
 
 
     def get_property(self, vm_id, property_name, section): # section is string or list
-        # This is largely what _get_section does. Consider refactoring to use _get_section.
-        # For now, implement as per original structure.
-        section_path_str = ""
-        if isinstance(section, str):
-            section_path_str = "of {}".format(section)
-        elif isinstance(section, list): # Assumes list is ordered correctly for AppleScript path
-            section_path_str = " ".join(["of {}".format(s) for s in section])
+        return self.get_properties(vm_id, [(property_name, section)])[property_name]
 
-        command = 'get {} {} of vm id "{}"'.format(property_name, section_path_str, vm_id)
-        return self._call_veertu_app(command, vm_id, return_formatted=False) # Raw string output
-
-
-    def version(self):
-        command = 'version' # This is 'version of application "Veertu"'
+    def get_properties(self, vm_id, properties):
+        """
+        Reads several VM properties in one osascript round trip. `properties` is a list of
+        (property name, section) pairs, where section is a string or a list ordered as the
+        AppleScript path (most specific first). Returns {property name: value as text},
+        with missing values as '-'.
+        """
+        if not properties:
+            return {}
+        references = [_property_reference(property_name, _as_section(section)) for property_name, section in properties]
+        cached = self._property_cache.get(str(vm_id), references) if self.use_property_cache else {}
+        if all(reference in cached for reference in references):
+            # Not remembered for set_property: the rows may predate changes made elsewhere
+            return {property_name: cached[reference] for (property_name, _), reference in zip(properties, references)}
+        expressions = ['get {}of vm_ref'.format(reference) for reference in references]
+        body = '\n'.join(self._joined_values_lines(expressions, missing='-'))
+        # The vm id is the only placeholder, so the name fallback can re-run the script by id.
+        command = 'set vm_ref to vm id "{0}"\n' + body.replace('{', '{{').replace('}', '}}')
+        output = self._call_veertu_with_name_fallback(command, vm_id, id_value=vm_id, return_formatted=False,
+                                                      shared=True)
+        values = self._split_joined_values(output, len(properties))
+        if self.use_property_cache:
+            self._property_cache.put(str(vm_id), dict(zip(references, values)))
+        read_at = time.monotonic()
+        for reference, value in zip(references, values):
+            self._property_values[(str(vm_id), reference)] = (value, read_at)
+        return {property_name: value for (property_name, _), value in zip(properties, values)}
+
+
+    # Classifies the outcome in one round trip: "ok:<version>" or "err:<number>:<message>".
+    _VERSION_SCRIPT = ('try\n'
+                       'return "ok:" & (version of application "{}")\n'
+                       'on error errMsg number errNum\n'
+                       'return "err:" & errNum & ":" & errMsg\n'
+                       'end try')
+    # errAENoSuchObject, reported when the application object cannot be resolved.
+    _NO_SUCH_OBJECT_ERROR = -1728
+
+    def version(self, app=None):
+        if self._answered_version.get(app or self.app):
+            return True
         try:
-            # _call_veertu_app will handle subprocess.CalledProcessError and raise VeertuAppNotFoundException if app not found
-            response_list = self._call_veertu_app(command, return_formatted=True) # Expect list from _split_and_strip
-            if response_list and response_list[0]: # Check if list is not empty and first item is not empty string
-                return True # Successfully got a version string (content of string not checked here)
-        except VeertuAppNotFoundException: # Catch specific exception from _call_veertu_app
-            raise # Re-raise it as it's the expected behavior for this method
-        except VeertuManagerException as e: # Catch other manager exceptions (e.g. OSA script failed for other reasons)
-             # This indicates app was found but 'version' command failed.
-             # Depending on desired behavior, either raise e or treat as version check failure (return False)
-             # Original code implies any failure other than CalledProcessError (now VeertuAppNotFoundException) means False.
-             # However, if 'version' command itself is malformed or app is in bad state, it should be an error.
-             # For now, let's stick to raising if it's not specifically "app not found".
-             raise VeertuManagerException("Failed to get version, app communication error: {}".format(e))
-
-        return False # Should only be reached if response_list was empty or contained empty string
+            # Raises VeertuAppNotFoundException itself if osascript cannot even compile the reference
+            output = self._run_osascript(self._VERSION_SCRIPT.format(self._quoted_app(app)))
+        except VeertuAppNotFoundException:
+            raise
+        except VeertuManagerException as e:
+            raise VeertuManagerException("Failed to get version, app communication error: {}".format(e))
+        status, _, detail = output.partition(':')
+        if status == 'ok':
+            if not detail: # Answered, but with an empty version string
+                return False
+            self._answered_version[app or self.app] = True
+            return True
+        number, _, message = detail.partition(':')
+        if self._is_int_parsed(number) and int(number) in _APP_NOT_FOUND_ERRORS + (self._NO_SUCH_OBJECT_ERROR,):
+            if app is None and self._app_from_cache:
+                # The app name verified by an earlier run has gone stale; find the current one
+                self._reprobe_app()
+                return self.version()
+            raise VeertuAppNotFoundException('Application "{}" not found or not running. OSA Error: {}'.format(
+                app or self.app, message))
+        raise VeertuManagerException("Failed to get version, app communication error: {}".format(message or output))
 
 
     @classmethod
     def _split_and_strip(cls, str_list_input): # Renamed str_list to str_list_input
         if not isinstance(str_list_input, str): # Ensure input is a string
             return [] # Or handle error appropriately
-        # AppleScript lists are comma-separated. 'missing value' is a common placeholder.
-        items = [item.strip().replace('missing value', '-') for item in str_list_input.split(',')]
-        # If the only item is an empty string as a result of splitting an empty string, return empty list
-        if len(items) == 1 and items[0] == '':
-            return []
-        return items
+        return list(_split_applescript_list(str_list_input))
 
 
 class VeertuManagerException(Exception):
@@ -782,6 +1584,25 @@ class VeertuManager120(VeertuManager): # Example for version specific manager
     pass
 
 
-def get_veertu_manager(version='1.2.0'): # Version param not currently used to select class
-    # Basic factory, could be extended if more manager versions are needed.
-    return VeertuManager120()
+# Managers handed out by get_veertu_manager, by version.
+_managers: Dict[str, VeertuManager] = {}
+
+
+def get_veertu_manager(version: str = '1.2.0') -> VeertuManager: # Version param not currently used to select class
+    """
+    Returns the process-wide manager, so every caller shares its caches and osascript session.
+    Built on first call; could be extended if more manager versions are needed.
+    """
+    manager = _managers.get(version)
+    if manager is None:
+        manager = _managers[version] = VeertuManager120()
+    return manager
+
+
+def reset_veertu_manager() -> None:
+    """Closes the shared managers; the next get_veertu_manager() call builds a new one."""
+    while _managers:
+        _managers.popitem()[1].close()
+
+
+atexit.register(reset_veertu_manager)
@@ -0,0 +1,32 @@
+import pytest
+from tabulate import tabulate
+from src.veertu_cli.formatter import CliFormatter, _fast_grid
+
+# _fast_grid must draw exactly what tabulate draws, or decline (None) and leave it to tabulate.
+
+
+@pytest.mark.parametrize('headers, rows', [
+    (('id', 'name'), (('vm-1', 'alpha'), ('vm-2', 'beta'))),
+    ((), (('ram', '2048MB'), ('cpu', '2'))),
+    (('size',), (('1,024',), ('2,048',))), # Thousands-grouped numbers are right-aligned by tabulate
+    (('size', 'name'), (('1,024', 'a'), ('x', 'b'))),
+    (('port',), (('80',), ('8,080.5',))),
+    (('value',), (('1_000',), ('-',))),
+    (('state',), (('running',), ('undefined/power off',))),
+])
+def test_fast_grid_matches_tabulate(headers, rows):
+    fast = _fast_grid(headers, rows)
+    if fast is not None:
+        assert fast == tabulate(rows, headers=headers, tablefmt='grid')
+
+
+def test_fast_grid_declines_numeric_cells():
+    assert _fast_grid(('size',), (('1,024',),)) is None
+
+
+def test_list_of_dicts_shows_keys_of_later_rows():
+    output = CliFormatter().format_list_of_dicts([{'id': 'vm-1', 'name': 'a'}, {'id': 'vm-2', 'name': 'b', 'extra': 'x'}])
+    header, first, second = [line for line in output.splitlines() if line.startswith('|')]
+    assert header.split('|')[1:4] == [' id   ', ' name   ', ' extra   ']
+    assert first.split('|')[3].strip() == ''
+    assert second.split('|')[3].strip() == 'x'
@@ -0,0 +1,72 @@
+import sqlite3
+
+import pytest
+from src.veertu_cli import property_cache
+from src.veertu_cli.property_cache import PropertyCache
+
+REFERENCES = ['ram of hardware ', 'headless of advanced settings ']
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'props.sqlite')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """time.time() as seen by the cache, moved forward by assigning clock.now."""
+    class Clock(object):
+        now = 1000.0
+    monkeypatch.setattr(property_cache.time, 'time', lambda: Clock.now)
+    return Clock
+
+
+def test_values_are_shared_between_instances(path, clock):
+    cache = PropertyCache(path)
+    cache.put('vm-1', {REFERENCES[0]: '2048'})
+    cache.close()
+    assert PropertyCache(path).get('vm-1', REFERENCES) == {REFERENCES[0]: '2048'}
+    assert PropertyCache(path).get('vm-2', REFERENCES) == {}
+
+
+def test_values_expire_after_ttl(path, clock):
+    cache = PropertyCache(path)
+    cache.put('vm-1', dict.fromkeys(REFERENCES, 'x'))
+    clock.now += PropertyCache.TTL - 1
+    assert len(cache.get('vm-1', REFERENCES)) == 2
+    clock.now += 2
+    assert cache.get('vm-1', REFERENCES) == {}
+
+
+def test_other_epoch_is_purged(path, clock):
+    cache = PropertyCache(path, epoch=lambda: 'Veertu@1')
+    cache.put('vm-1', {REFERENCES[0]: '2048'})
+    cache.close()
+    # The app was updated: nothing cached before is served, and the rows are deleted
+    assert PropertyCache(path, epoch=lambda: 'Veertu@2').get('vm-1', REFERENCES) == {}
+    with sqlite3.connect(path) as db:
+        assert db.execute('SELECT COUNT(*) FROM props').fetchone()[0] == 0
+
+
+def test_clear_empties_the_cache(path, clock):
+    cache = PropertyCache(path)
+    cache.put('vm-1', {REFERENCES[0]: '2048'})
+    cache.clear()
+    assert PropertyCache(path).get('vm-1', REFERENCES) == {}
+
+
+def test_clear_does_not_create_the_database(path):
+    PropertyCache(path).clear()
+    assert not property_cache.os.path.exists(path)
+
+
+@pytest.mark.parametrize('make_unusable', [
+    lambda path: property_cache.os.makedirs(path), # Not a file at all
+    lambda path: open(path, 'wb').write(b'not a database' * 100),
+])
+def test_unusable_database_disables_the_cache(path, make_unusable):
+    make_unusable(path)
+    cache = PropertyCache(path)
+    cache.put('vm-1', {REFERENCES[0]: '2048'})
+    assert cache.get('vm-1', REFERENCES) == {}
+    assert cache._broken
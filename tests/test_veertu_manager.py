@@ -0,0 +1,182 @@
+import sys
+import textwrap
+import time
+
+import pytest
+from src.veertu_cli import veertu_manager
+from src.veertu_cli.veertu_manager import VeertuManager, _OsascriptSession
+
+# A stand-in for `osascript -i`: prompts with '>> ' and echoes each result in source form.
+FAKE_INTERPRETER = textwrap.dedent('''
+    import sys, time
+    while True:
+        sys.stdout.write('>> ')
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            break
+        line = line.strip()
+        if line.startswith('"'):
+            print('=> ' + line)
+        elif 'every vm' in line:
+            print('=> {"vm-1", "alpha, \\\\"the first\\\\"", "vm-2", missing value}')
+        elif 'hang' in line:
+            time.sleep(60)
+        else:
+            print("!! Can't get vm id \\"nope\\".")
+''')
+
+
+class FakeVeertu(object):
+    """Answers the scripts a VeertuManager runs; VMs are {id: name}, and every script is recorded."""
+
+    def __init__(self, vms):
+        self.vms = dict(vms)
+        self.scripts = []
+        # Called with the manager while a delete is in flight, before the app deletes the VM
+        self.during_delete = None
+
+    def __call__(self, manager, script):
+        self.scripts.append(script)
+        if 'version of application' in script:
+            return 'ok:2.0'
+        if '{id, name} of every vm' in script:
+            return ', '.join('{}, {}'.format(vm_id, name) for vm_id, name in self.vms.items())
+        if 'set results to {}' in script: # set_properties: every setting in the batch succeeds
+            return ', '.join(['true'] * script.count('set end of results to true'))
+        vm_id = script.split('vm id "', 1)[1].split('"', 1)[0]
+        if vm_id not in self.vms:
+            raise manager._osa_error('execution error: Veertu got an error: '
+                                     'Can\u2019t get vm id "{}". (-1728)'.format(vm_id), script)
+        if script.startswith('tell application "Veertu" to delete'):
+            if self.during_delete:
+                self.during_delete(manager)
+            del self.vms[vm_id]
+        return 'true'
+
+
+@pytest.fixture
+def veertu(tmp_path, monkeypatch):
+    """A FakeVeertu standing in for osascript, with the manager's caches kept in tmp_path."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    fake = FakeVeertu({'vm-1': 'alpha', 'vm-2': 'beta'})
+    monkeypatch.setattr(VeertuManager, '_execute_osascript', lambda manager, script: fake(manager, script))
+    return fake
+
+
+@pytest.fixture
+def manager(veertu):
+    veertu_manager = VeertuManager()
+    veertu.scripts.clear() # Forget the version probes
+    yield veertu_manager
+    veertu_manager.close()
+
+
+def test_missing_vm_error_is_vm_not_found(manager):
+    error = manager._osa_error('Veertu got an error: Can\u2019t get vm id "x". (-1728)', 'script')
+    assert isinstance(error, veertu_manager.VMNotFoundException)
+    other = manager._osa_error('Veertu got an error: Can\u2019t get port forwarding "x". (-1728)', 'script')
+    assert not isinstance(other, veertu_manager.VMNotFoundException)
+
+
+def test_name_is_resolved_once(manager, veertu):
+    assert manager.start('alpha') is True
+    assert [s for s in veertu.scripts if 'start of' in s] == [
+        'tell application "Veertu" to start of vm id "alpha"',
+        'tell application "Veertu" to start of vm id "vm-1"',
+    ]
+    veertu.scripts.clear()
+    assert manager.pause('alpha') is True
+    # The id the name resolved to is used straight away, without trying the name as an id
+    assert veertu.scripts == ['tell application "Veertu" to suspend of vm id "vm-1"']
+
+
+def test_name_is_found_in_the_list_index(manager, veertu):
+    manager.list()
+    veertu.scripts.clear()
+    assert manager.start('beta') is True
+    # The cached list's name index answers; the VMs are not listed again
+    assert veertu.scripts == ['tell application "Veertu" to start of vm id "beta"',
+                              'tell application "Veertu" to start of vm id "vm-2"']
+    with pytest.raises(veertu_manager.VMNotFoundException):
+        manager.start('gamma')
+
+
+def test_list_after_delete_is_fresh(manager, veertu):
+    assert len(manager.list()) == 2
+    # e.g. an apply_bulk worker listing the VMs while the delete runs
+    veertu.during_delete = lambda m: m.list()
+    assert manager.delete('vm-1') is True
+    assert manager.list() == [{'id': 'vm-2', 'name': 'beta'}]
+    with pytest.raises(veertu_manager.VMNotFoundException):
+        manager.start('alpha')
+
+
+def test_set_properties_escapes_the_new_name(manager, veertu):
+    assert manager.set_properties('vm-1', {'name': 'my "vm"', 'cpu': 2}) == {'name': True, 'cpu': True}
+    assert 'rename vm id "vm-1" to name "my \\"vm\\""' in veertu.scripts[-1].splitlines()
+
+
+@pytest.mark.parametrize('session_flag', [False, True]) # Thread pool, or one call after another
+def test_apply_bulk_keeps_input_order(manager, monkeypatch, session_flag):
+    monkeypatch.setattr(veertu_manager, '_OSASCRIPT_SESSION', session_flag)
+    applied = []
+
+    def set_cpu(vm_id, count):
+        if count == 2:
+            time.sleep(0.1) # Would let the second call on vm-1 overtake it if they overlapped
+        if count < 0:
+            raise veertu_manager.VeertuManagerException('bad count')
+        applied.append((vm_id, count))
+        return '{}:{}'.format(vm_id, count)
+
+    manager.set_cpu = set_cpu
+    results = manager.apply_bulk('set_cpu', [('vm-1', 2), ('vm-2', 3), ('vm-1', 4), ('vm-2', -1)])
+    assert results[:3] == ['vm-1:2', 'vm-2:3', 'vm-1:4']
+    assert isinstance(results[3], veertu_manager.VeertuManagerException)
+    assert [count for vm_id, count in applied if vm_id == 'vm-1'] == [2, 4]
+
+
+def test_writes_clear_the_shared_property_cache(manager, veertu):
+    assert manager.get_property('vm-1', 'cpu count', 'hardware') == 'true'
+    veertu.scripts.clear()
+    assert manager.get_property('vm-1', 'cpu count', 'hardware') == 'true'
+    assert veertu.scripts == [] # Served by the property cache
+    manager.set_cpu('vm-1', 4)
+    veertu.scripts.clear()
+    manager.get_property('vm-1', 'cpu count', 'hardware')
+    assert len(veertu.scripts) == 1
+
+
+@pytest.fixture
+def session(tmp_path):
+    script = tmp_path / 'fake_osascript.py'
+    script.write_text(FAKE_INTERPRETER)
+    osascript_session = _OsascriptSession([sys.executable, str(script)])
+    yield osascript_session
+    osascript_session._proc.kill()
+    osascript_session._proc.wait()
+
+
+def test_session_decodes_source_form_results(session):
+    output, error = session.run('tell application "Veertu" to {id, name} of every vm')
+    assert error is None
+    assert output == 'vm-1, alpha, "the first", vm-2, missing value'
+    # The sentinel was consumed, so the next script gets its own output
+    assert session.run('"plain"') == ('plain', None)
+
+
+def test_session_reports_errors(session):
+    _, error = session.run('tell application "Veertu" to start of vm id "nope"')
+    assert error == 'Can\'t get vm id "nope".'
+
+
+def test_session_times_out(session, monkeypatch):
+    monkeypatch.setattr(_OsascriptSession, 'TIMEOUT', 0.5)
+    with pytest.raises(OSError):
+        session.run('hang')
+
+
+def test_from_applescript_source():
+    assert veertu_manager._from_applescript_source('{"a", {"b", 2}, missing value}') == 'a, b, 2, missing value'
+    assert veertu_manager._from_applescript_source('"x\\\\y"') == 'x\\y'